@@ -112,23 +112,65 @@ def analyze_lookup_entry(entry: Dict[str, Any], analyzer: CommentAnalyzer, max_r
     
     return entry
 
-def save_checkpoint(lookup_table: List[Dict[str, Any]], checkpoint_file: str):
-    """Save checkpoint of current progress."""
+# Entry fields written by analysis; the checkpoint journal records only these
+ANALYSIS_FIELDS = ('stance', 'key_quote', 'rationale', 'themes')
+
+def save_checkpoint(entries: List[Dict[str, Any]], checkpoint_file: str, append: bool = True):
+    """
+    Save checkpoint of current progress.
+    
+    The checkpoint is a journal with one JSON line per analyzed entry holding its
+    lookup_id and analysis fields, so each save writes only the entries analyzed
+    since the last one instead of the whole table.
+    
+    Args:
+        entries: Newly analyzed entries to record
+        checkpoint_file: Journal file to write
+        append: Add to the existing journal; False starts it over
+    """
     try:
-        with open(checkpoint_file, 'w', encoding='utf-8') as f:
-            json.dump(lookup_table, f, indent=2, ensure_ascii=False)
+        with open(checkpoint_file, 'a' if append else 'w', encoding='utf-8') as f:
+            for entry in entries:
+                record = {'lookup_id': entry.get('lookup_id')}
+                record.update((field, entry.get(field)) for field in ANALYSIS_FIELDS)
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
         logger.info(f"Checkpoint saved to {checkpoint_file}")
     except Exception as e:
         logger.error(f"Failed to save checkpoint: {e}")
 
-def load_checkpoint(checkpoint_file: str) -> Optional[List[Dict[str, Any]]]:
-    """Load checkpoint if it exists."""
+def load_checkpoint(checkpoint_file: str, lookup_table: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Load checkpoint if it exists, replaying its journal onto lookup_table.
+    
+    Checkpoints written before the journal format hold the whole table and are
+    returned as they are.
+    
+    Returns:
+        The updated lookup table, or None if there is no usable checkpoint
+    """
     if os.path.exists(checkpoint_file):
         try:
             with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            logger.info(f"Loaded checkpoint from {checkpoint_file}")
-            return data
+                if f.read(1) == '[':
+                    f.seek(0)
+                    data = json.load(f)
+                    logger.info(f"Loaded checkpoint from {checkpoint_file}")
+                    return data
+                f.seek(0)
+                
+                entries_by_id = {entry.get('lookup_id'): entry for entry in lookup_table}
+                replayed = 0
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Blank or partially written line from an interrupted save
+                    entry = entries_by_id.get(record.pop('lookup_id', None))
+                    if entry is not None:
+                        entry.update(record)
+                        replayed += 1
+            logger.info(f"Loaded checkpoint from {checkpoint_file} ({replayed} analyzed entries)")
+            return lookup_table
         except Exception as e:
             logger.error(f"Failed to load checkpoint: {e}")
             return None
@@ -173,92 +215,75 @@ def analyze_lookup_table_batch(lookup_table: List[Dict[str, Any]],
     
     # Process entries
     checkpoint_interval = 50  # Save checkpoint every 50 entries
-    processed_since_checkpoint = 0
+    pending_checkpoint = []
     
-    for i in range(0, total_entries, batch_size):
-        batch = lookup_table[i:i + batch_size]
-        
-        # Filter out already analyzed entries
-        unanalyzed_batch = [entry for entry in batch if entry.get('stance') is None]
-        
-        if not unanalyzed_batch:
-            continue
-        
-        logger.info(f"Processing batch {i//batch_size + 1}: entries {i+1}-{min(i+batch_size, total_entries)} ({len(unanalyzed_batch)} unanalyzed)")
-        
-        if use_parallel and len(unanalyzed_batch) > 1:
-            # Parallel processing
-            with concurrent.futures.ThreadPoolExecutor(max_workers=min(batch_size, len(unanalyzed_batch))) as executor:
-                # Submit tasks
-                future_to_entry = {
-                    executor.submit(analyze_lookup_entry, entry, analyzer): entry 
-                    for entry in unanalyzed_batch
-                }
-                
-                # Collect results with timeout
-                for future in concurrent.futures.as_completed(future_to_entry, timeout=300):  # 5 min timeout
-                    try:
-                        result = future.result(timeout=60)  # 1 min timeout per task
-                        # Update the original entry in the lookup table
-                        original_entry = future_to_entry[future]
-                        original_entry.update(result)
-                        
-                    except concurrent.futures.TimeoutError:
-                        entry = future_to_entry[future]
-                        lookup_id = entry.get('lookup_id', 'unknown')
-                        logger.error(f"Timeout processing entry {lookup_id} in parallel")
-                        
-                        # Add error analysis
-                        entry.update({
-                            'stance': '',
-                            'key_quote': '',
-                            'rationale': 'Error: Processing timeout',
-                            'themes': ''
-                        })
-                        
-                    except Exception as e:
-                        entry = future_to_entry[future]
-                        lookup_id = entry.get('lookup_id', 'unknown')
-                        logger.error(f"Error processing entry {lookup_id}: {e}")
-                        
-                        # Add error analysis
-                        entry.update({
-                            'stance': '',
-                            'key_quote': '',
-                            'rationale': f'Error: {str(e)}',
-                            'themes': ''
-                        })
-        else:
-            # Sequential processing
-            for entry in unanalyzed_batch:
-                try:
-                    updated_entry = analyze_lookup_entry(entry, analyzer)
-                    entry.update(updated_entry)
-                except Exception as e:
-                    lookup_id = entry.get('lookup_id', 'unknown')
-                    logger.error(f"Error processing entry {lookup_id}: {e}")
-                    entry.update({
-                        'stance': '',
-                        'key_quote': '',
-                        'rationale': f'Error: {str(e)}',
-                        'themes': ''
-                    })
-        
-        processed_since_checkpoint += len(unanalyzed_batch)
-        
-        # Save checkpoint periodically
-        if checkpoint_file and processed_since_checkpoint >= checkpoint_interval:
-            save_checkpoint(lookup_table, checkpoint_file)
-            processed_since_checkpoint = 0
+    # Start the journal with the entries analyzed before this run, so replaying it
+    # onto the input table restores everything done so far
+    if checkpoint_file:
+        save_checkpoint([entry for entry in lookup_table if entry.get('stance') is not None],
+                        checkpoint_file, append=False)
+    
+    def record_error(entry: Dict[str, Any], rationale: str):
+        entry.update({
+            'stance': '',
+            'key_quote': '',
+            'rationale': rationale,
+            'themes': ''
+        })
+    
+    def checkpoint_if_due():
+        nonlocal pending_checkpoint
+        if checkpoint_file and len(pending_checkpoint) >= checkpoint_interval:
+            save_checkpoint(pending_checkpoint, checkpoint_file)
+            pending_checkpoint = []
             
             # Show progress
             current_analyzed = count_analyzed_entries(lookup_table)
             progress = current_analyzed / total_entries * 100
             logger.info(f"Progress: {current_analyzed}/{total_entries} ({progress:.1f}%) analyzed")
     
+    unanalyzed_entries = [entry for entry in lookup_table if entry.get('stance') is None]
+    
+    if use_parallel and len(unanalyzed_entries) > 1:
+        # One pool keeps batch_size requests in flight at all times, so a slow response
+        # only occupies its own worker instead of holding back a whole batch; each call
+        # is bounded by the analyzer's own timeout and retries
+        logger.info(f"Analyzing {len(unanalyzed_entries)} entries with {batch_size} concurrent requests")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=batch_size) as executor:
+            future_to_entry = {
+                executor.submit(analyze_lookup_entry, entry, analyzer): entry 
+                for entry in unanalyzed_entries
+            }
+            
+            for future in concurrent.futures.as_completed(future_to_entry):
+                # Update the original entry in the lookup table
+                original_entry = future_to_entry[future]
+                try:
+                    original_entry.update(future.result())
+                except Exception as e:
+                    lookup_id = original_entry.get('lookup_id', 'unknown')
+                    logger.error(f"Error processing entry {lookup_id}: {e}")
+                    record_error(original_entry, f'Error: {str(e)}')
+                
+                pending_checkpoint.append(original_entry)
+                checkpoint_if_due()
+    else:
+        # Sequential processing
+        for entry in unanalyzed_entries:
+            try:
+                updated_entry = analyze_lookup_entry(entry, analyzer)
+                entry.update(updated_entry)
+            except Exception as e:
+                lookup_id = entry.get('lookup_id', 'unknown')
+                logger.error(f"Error processing entry {lookup_id}: {e}")
+                record_error(entry, f'Error: {str(e)}')
+            
+            pending_checkpoint.append(entry)
+            checkpoint_if_due()
+    
     # Final checkpoint
-    if checkpoint_file:
-        save_checkpoint(lookup_table, checkpoint_file)
+    if checkpoint_file and pending_checkpoint:
+        save_checkpoint(pending_checkpoint, checkpoint_file)
     
     final_analyzed = count_analyzed_entries(lookup_table)
     logger.info(f"Analysis complete! {final_analyzed}/{total_entries} entries analyzed")
@@ -335,19 +360,16 @@ def main():
     
     # Load or resume lookup table
     checkpoint_file = f"{args.output}.checkpoint"
-    lookup_table = None
+    try:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            lookup_table = json.load(f)
+        logger.info(f"Loaded {len(lookup_table)} lookup entries from {args.input}")
+    except Exception as e:
+        logger.error(f"Error loading {args.input}: {e}")
+        return
     
     if args.resume:
-        lookup_table = load_checkpoint(checkpoint_file)
-    
-    if not lookup_table:
-        try:
-            with open(args.input, 'r', encoding='utf-8') as f:
-                lookup_table = json.load(f)
-            logger.info(f"Loaded {len(lookup_table)} lookup entries from {args.input}")
-        except Exception as e:
-            logger.error(f"Error loading {args.input}: {e}")
-            return
+        lookup_table = load_checkpoint(checkpoint_file, lookup_table) or lookup_table
     
     # Initialize analyzer
     try:
@@ -377,7 +399,7 @@ def main():
         
         # Save final results
         with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(analyzed_lookup_table, f, indent=2, ensure_ascii=False)
+            json.dump(analyzed_lookup_table, f, separators=(',', ':'), ensure_ascii=False)
         
         logger.info(f"\n✅ Analysis complete!")
         logger.info(f"Results saved to {args.output}")
@@ -13,9 +13,9 @@ python create_lookup_table.py [--input raw_data.json] [--output lookup_table.jso
 import json
 import os
 import argparse
+import hashlib
 import logging
 from typing import List, Dict, Any, Optional
-import re
 
 # Import config constants
 from ..config import config
@@ -97,6 +97,12 @@ def extract_and_combine_text(comment_data: Dict[str, Any], truncate_chars: Optio
             'attachment_text': ''
         }
 
+# Character variants folded together for duplicate detection
+DEDUP_REPLACEMENTS = (
+    ('„', '"'), ('«', '"'), ('»', '"'),  # Normalize quotes
+    ('—', '-'), ('–', '-'), ('−', '-'),  # Normalize dashes
+)
+
 def normalize_text_for_dedup(text: str) -> str:
     """
     Normalize text for duplicate detection.
@@ -110,18 +116,31 @@ def normalize_text_for_dedup(text: str) -> str:
     if not text:
         return ""
     
-    # Convert to lowercase and strip whitespace
-    normalized = text.lower().strip()
-    
-    # Remove extra whitespace (multiple spaces, newlines, tabs)
-    normalized = re.sub(r'\s+', ' ', normalized)
+    # Convert to lowercase and collapse whitespace (multiple spaces, newlines, tabs);
+    # str.split() splits on the same characters as \s and drops the ends like strip()
+    normalized = ' '.join(text.lower().split())
     
-    # Remove common formatting that might vary
-    normalized = re.sub(r'[""''""„"«»]', '"', normalized)  # Normalize quotes
-    normalized = re.sub(r'[—–−]', '-', normalized)  # Normalize dashes
+    # Remove common formatting that might vary; most texts contain none of these
+    # characters, and the membership test is far cheaper than a regex pass
+    for variant, replacement in DEDUP_REPLACEMENTS:
+        if variant in normalized:
+            normalized = normalized.replace(variant, replacement)
     
     return normalized
 
+def dedup_key(normalized_text: str) -> str:
+    """
+    Digest of normalized text, stored on each lookup entry so later runs can match
+    duplicates without normalizing every existing entry again.
+    
+    Args:
+        normalized_text: Output of normalize_text_for_dedup
+    
+    Returns:
+        32-character hex digest
+    """
+    return hashlib.blake2b(normalized_text.encode('utf-8'), digest_size=16).hexdigest()
+
 def create_lookup_table(raw_data: List[Dict[str, Any]], truncate_chars: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Create deduplicated lookup table from raw comment data.
@@ -195,6 +214,7 @@ def create_lookup_table(raw_data: List[Dict[str, Any]], truncate_chars: Optional
             'comment_count': len(group_data['comment_ids']),
             'full_text_length': group_data['full_text_length'],
             'truncated_text_length': group_data['truncated_text_length'],
+            'dedup_key': dedup_key(normalized_text),
             # LLM analysis fields (to be filled later)
             'stance': None,
             'key_quote': None,
@@ -284,7 +304,7 @@ def main():
         
         # Save lookup table
         with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(lookup_table, f, indent=2, ensure_ascii=False)
+            json.dump(lookup_table, f, separators=(',', ':'), ensure_ascii=False)
         
         logger.info(f"\n✅ Lookup table saved to {args.output}")
         logger.info(f"Created {len(lookup_table)} unique text entries from {len(raw_data)} comments")
@@ -19,16 +19,21 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 import re
+import logging
 from typing import List, Dict, Any, Optional, Tuple
 
 # Import cluster description functionality
 try:
-    from cluster_descriptions import parse_cluster_report, generate_cluster_descriptions, save_cluster_descriptions
+    from backend.analysis.cluster_descriptions import parse_cluster_report, generate_cluster_descriptions, save_cluster_descriptions
 except ImportError:
-    # Fallback if module not available
-    parse_cluster_report = None
-    generate_cluster_descriptions = None
-    save_cluster_descriptions = None
+    try:
+        # Standalone script run from this directory
+        from cluster_descriptions import parse_cluster_report, generate_cluster_descriptions, save_cluster_descriptions
+    except ImportError:
+        # Fallback if module not available
+        parse_cluster_report = None
+        generate_cluster_descriptions = None
+        save_cluster_descriptions = None
 
 # Core ML libraries
 from sentence_transformers import SentenceTransformer
@@ -38,6 +43,10 @@ from sklearn.metrics import silhouette_score
 from scipy.cluster.hierarchy import dendrogram, linkage
 from scipy.spatial.distance import cdist, pdist
 
+# Child of the "pipeline" logger so in-process runs write to pipeline.log; the
+# record still propagates to the root handlers that resume_pipeline configures
+logger = logging.getLogger(f"pipeline.{__name__}")
+
 def strip_html_tags(text):
     """Remove HTML tags from text"""
     if not text:
@@ -63,7 +72,7 @@ def find_most_recent_lookup_table():
         result_dirs = glob.glob(os.path.join(results_base, "results_*"))
         search_paths.extend(result_dirs)
     
-    print(f"🔍 Looking for lookup_table.json files...")
+    logger.info(f"🔍 Looking for lookup_table.json files...")
     
     candidates = []
     for search_path in search_paths:
@@ -71,24 +80,24 @@ def find_most_recent_lookup_table():
             lookup_file = os.path.join(search_path, "lookup_table.json")
             if os.path.exists(lookup_file):
                 candidates.append(lookup_file)
-                print(f"📁 Found: {lookup_file}")
+                logger.info(f"📁 Found: {lookup_file}")
     
     if candidates:
         # Sort by modification time, newest first
         candidates.sort(key=os.path.getctime, reverse=True)
-        print(f"✅ Most recent: {candidates[0]}")
+        logger.info(f"✅ Most recent: {candidates[0]}")
         return candidates[0]
     
     return None
 
 def load_lookup_table(input_file: str) -> Tuple[List[Dict], List[str], List[str]]:
     """Load analyzed lookup table and extract texts for clustering"""
-    print(f"📖 Loading lookup table from {input_file}...")
+    logger.info(f"📖 Loading lookup table from {input_file}...")
     
     with open(input_file, 'r', encoding='utf-8') as f:
         lookup_data = json.load(f)
     
-    print(f"✅ Loaded {len(lookup_data):,} lookup entries")
+    logger.info(f"✅ Loaded {len(lookup_data):,} lookup entries")
     
     processed_entries = []
     comment_texts = []
@@ -104,27 +113,27 @@ def load_lookup_table(input_file: str) -> Tuple[List[Dict], List[str], List[str]
             comment_texts.append(text)
             lookup_ids.append(lookup_id)
     
-    print(f"✅ Processed {len(processed_entries):,} entries with valid text")
+    logger.info(f"✅ Processed {len(processed_entries):,} entries with valid text")
     
     # Show analysis status
     analyzed_count = len([e for e in processed_entries if e.get('stance')])
     total_comments = sum(e.get('comment_count', 0) for e in processed_entries)
     
-    print(f"📊 Analysis status:")
-    print(f"   Analyzed entries: {analyzed_count:,}/{len(processed_entries):,} ({analyzed_count/len(processed_entries)*100:.1f}%)")
-    print(f"   Total comments represented: {total_comments:,}")
+    logger.info(f"📊 Analysis status:")
+    logger.info(f"   Analyzed entries: {analyzed_count:,}/{len(processed_entries):,} ({analyzed_count/len(processed_entries)*100:.1f}%)")
+    logger.info(f"   Total comments represented: {total_comments:,}")
     
     return processed_entries, comment_texts, lookup_ids
 
 def create_embeddings(texts: List[str], model_name: str = "sentence-transformers/all-mpnet-base-v2") -> np.ndarray:
     """Create semantic embeddings for the texts"""
-    print(f"🤖 Loading model: {model_name}")
+    logger.info(f"🤖 Loading model: {model_name}")
     model = SentenceTransformer(model_name)
     
-    print(f"🔄 Creating embeddings for {len(texts):,} unique texts...")
+    logger.info(f"🔄 Creating embeddings for {len(texts):,} unique texts...")
     embeddings = model.encode(texts, show_progress_bar=True, batch_size=32)
     
-    print(f"✅ Created embeddings with shape: {embeddings.shape}")
+    logger.info(f"✅ Created embeddings with shape: {embeddings.shape}")
     return embeddings
 
 def calculate_wcss(embeddings: np.ndarray, k_range: range) -> List[float]:
@@ -150,7 +159,7 @@ def calculate_wcss(embeddings: np.ndarray, k_range: range) -> List[float]:
             total_wcss += distance ** 2
         
         wcss.append(total_wcss)
-        print(f"  k={k}: WCSS = {total_wcss:.2f}")
+        logger.info(f"  k={k}: WCSS = {total_wcss:.2f}")
     
     return wcss
 
@@ -200,7 +209,7 @@ def plot_elbow_curve(wcss: List[float], k_range: range, elbow_k: int, output_dir
 
 def perform_hierarchical_clustering(embeddings: np.ndarray, n_clusters: int) -> Tuple[np.ndarray, Any]:
     """Perform hierarchical clustering"""
-    print(f"🌳 Performing hierarchical clustering with {n_clusters} clusters...")
+    logger.info(f"🌳 Performing hierarchical clustering with {n_clusters} clusters...")
     
     clustering = AgglomerativeClustering(n_clusters=n_clusters, linkage='ward')
     cluster_labels = clustering.fit_predict(embeddings)
@@ -208,10 +217,10 @@ def perform_hierarchical_clustering(embeddings: np.ndarray, n_clusters: int) ->
     # Create linkage matrix for dendrogram
     linkage_matrix = linkage(embeddings, method='ward')
     
-    print(f"✅ Clustering complete. Cluster distribution:")
+    logger.info(f"✅ Clustering complete. Cluster distribution:")
     unique, counts = np.unique(cluster_labels, return_counts=True)
     for cluster_id, count in zip(unique, counts):
-        print(f"  Cluster {cluster_id}: {count:,} texts ({count/len(cluster_labels)*100:.1f}%)")
+        logger.info(f"  Cluster {cluster_id}: {count:,} texts ({count/len(cluster_labels)*100:.1f}%)")
     
     return cluster_labels, linkage_matrix
 
@@ -301,17 +310,17 @@ def recursive_clustering(embeddings: np.ndarray, processed_entries: List[Dict],
         
         should_subcluster = embedding_variance > min_variance_threshold
         
-        print(f"{'  ' * level}  Semantic variance: {embedding_variance:.4f} (threshold: {min_variance_threshold})")
+        logger.info(f"{'  ' * level}  Semantic variance: {embedding_variance:.4f} (threshold: {min_variance_threshold})")
         
         if should_subcluster:
-            print(f"\n{'  ' * level}📊 Subclustering Cluster {result['cluster_id']} ({len(cluster_entries)} texts)...")
+            logger.info(f"{'  ' * level}📊 Subclustering Cluster {result['cluster_id']} ({len(cluster_entries)} texts)...")
             
             # Use elbow method for subclusters (2-min(5, n_samples))
             max_subclusters = min(5, len(cluster_entries) - 1)
             
             if max_subclusters >= 2:
                 k_range = range(2, max_subclusters + 1)
-                print(f"{'  ' * level}  Finding optimal k using elbow method...")
+                logger.info(f"{'  ' * level}  Finding optimal k using elbow method...")
                 wcss = calculate_wcss(cluster_embeddings, k_range)
                 optimal_k = find_elbow_point(wcss, k_range)
                 
@@ -319,7 +328,7 @@ def recursive_clustering(embeddings: np.ndarray, processed_entries: List[Dict],
                 plot_elbow_curve(wcss, k_range, optimal_k, output_dir, 
                                prefix=f"Cluster {cluster_id_str} ")
                 
-                print(f"{'  ' * level}  Optimal k: {optimal_k}")
+                logger.info(f"{'  ' * level}  Optimal k: {optimal_k}")
                 
                 # Perform subclustering
                 sub_labels, _ = perform_hierarchical_clustering(cluster_embeddings, optimal_k)
@@ -332,14 +341,14 @@ def recursive_clustering(embeddings: np.ndarray, processed_entries: List[Dict],
                     )
                     result['subclusters'].append(sub_result)
             else:
-                print(f"{'  ' * level}  ⚠️  Too few entries ({len(cluster_entries)}) for subclustering")
+                logger.warning(f"{'  ' * level}  ⚠️  Too few entries ({len(cluster_entries)}) for subclustering")
     
     return result
 
 def create_hierarchical_visualization(clustering_results: List[Dict], processed_entries: List[Dict], 
                                     embeddings: np.ndarray, output_dir: str):
     """Create visualization of hierarchical clustering results"""
-    print("📊 Creating hierarchical visualization...")
+    logger.info("📊 Creating hierarchical visualization...")
     
     # Perform PCA for 2D visualization
     pca = PCA(n_components=2)
@@ -381,7 +390,7 @@ def create_hierarchical_visualization(clustering_results: List[Dict], processed_
 
 def create_hierarchical_report(clustering_results: List[Dict], output_dir: str):
     """Create detailed report of hierarchical clustering results"""
-    print("📝 Creating hierarchical clustering report...")
+    logger.info("📝 Creating hierarchical clustering report...")
     
     report_path = os.path.join(output_dir, 'hierarchical_cluster_report.txt')
     
@@ -468,7 +477,7 @@ def create_hierarchical_report(clustering_results: List[Dict], output_dir: str):
         for result in clustering_results:
             write_cluster_info(result, f)
     
-    print(f"✅ Report saved to: {report_path}")
+    logger.info(f"✅ Report saved to: {report_path}")
 
 def update_lookup_table_with_hierarchical_clusters(input_file: str, clustering_results: List[Dict], 
                                                  embeddings_2d: np.ndarray, processed_entries: List[Dict]) -> str:
@@ -516,40 +525,37 @@ def update_lookup_table_with_hierarchical_clusters(input_file: str, clustering_r
         
         # Save updated lookup table
         with open(input_file, 'w') as f:
-            json.dump(original_lookup_table, f, indent=2)
+            json.dump(original_lookup_table, f, separators=(',', ':'))
         
-        print(f"✅ Updated {updated_count} entries with hierarchical cluster IDs")
-        print(f"✅ Updated lookup table: {input_file}")
+        logger.info(f"✅ Updated {updated_count} entries with hierarchical cluster IDs")
+        logger.info(f"✅ Updated lookup table: {input_file}")
         
         return input_file
         
     except Exception as e:
-        print(f"❌ Error updating lookup table: {e}")
+        logger.error(f"❌ Error updating lookup table: {e}")
         return input_file
 
-def main():
-    """Main function"""
-    parser = argparse.ArgumentParser(description='Hierarchical clustering with elbow method')
-    parser.add_argument('--input', type=str, help='Path to lookup table JSON file')
-    parser.add_argument('--model', type=str, default='sentence-transformers/all-mpnet-base-v2',
-                       help='Sentence transformer model to use')
-    parser.add_argument('--output_dir', type=str, help='Output directory')
-    parser.add_argument('--sample', type=int, help='Sample N entries for testing (default: use all)')
-    
-    args = parser.parse_args()
-    
-    # Find input file
-    input_file = args.input
-    if input_file is None:
-        input_file = find_most_recent_lookup_table()
-        if input_file is None:
-            print("❌ Could not find lookup table file. Please specify with --input")
-            return
-    
+def run_hierarchical_clustering(input_file: str, output_dir: Optional[str] = None,
+                                model_name: str = 'sentence-transformers/all-mpnet-base-v2',
+                                sample: Optional[int] = None) -> Optional[str]:
+    """
+    Run hierarchical clustering on a lookup table and write cluster IDs back into it.
+    
+    Args:
+        input_file: Path to lookup table JSON file
+        output_dir: Pipeline output directory (results go in its cluster/ subdirectory).
+                    If None, a timestamped directory next to input_file is created.
+        model_name: Sentence transformer model to use
+        sample: Sample N entries for testing (default: use all)
+    
+    Returns:
+        Path to the clustering output directory, or None if there was nothing to cluster
+    """
     # Set output directory
-    if args.output_dir:
+    if output_dir:
         # If output_dir is provided (from pipeline), create cluster subdirectory
-        output_dir = os.path.join(args.output_dir, "cluster")
+        output_dir = os.path.join(output_dir, "cluster")
     else:
         # Standalone run - create timestamped directory
         input_dir = os.path.dirname(input_file)
@@ -558,39 +564,39 @@ def main():
     
     os.makedirs(output_dir, exist_ok=True)
     
-    print(f"🚀 Starting hierarchical clustering with elbow method...")
-    print(f"📁 Input: {input_file}")
-    print(f"📁 Output: {output_dir}")
+    logger.info(f"🚀 Starting hierarchical clustering with elbow method...")
+    logger.info(f"📁 Input: {input_file}")
+    logger.info(f"📁 Output: {output_dir}")
     
     # Load lookup table
     processed_entries, comment_texts, lookup_ids = load_lookup_table(input_file)
     
     if len(processed_entries) == 0:
-        print("❌ No valid entries found in lookup table")
-        return
+        logger.error("❌ No valid entries found in lookup table")
+        return None
     
     # Sample if requested
-    if args.sample and args.sample < len(processed_entries):
-        print(f"\n📊 Sampling {args.sample} entries for testing...")
+    if sample and sample < len(processed_entries):
+        logger.info(f"📊 Sampling {sample} entries for testing...")
         # Random sample
         import random
         random.seed(42)  # For reproducibility
-        indices = random.sample(range(len(processed_entries)), args.sample)
+        indices = random.sample(range(len(processed_entries)), sample)
         processed_entries = [processed_entries[i] for i in indices]
         comment_texts = [comment_texts[i] for i in indices]
         lookup_ids = [lookup_ids[i] for i in indices]
-        print(f"✅ Using {len(processed_entries)} sampled entries")
+        logger.info(f"✅ Using {len(processed_entries)} sampled entries")
     
     # Create embeddings
-    embeddings = create_embeddings(comment_texts, args.model)
+    embeddings = create_embeddings(comment_texts, model_name)
     
     # Find optimal number of main clusters using elbow method (2-min(5, n_samples))
-    print("\n🔍 Finding optimal number of main clusters using elbow method...")
+    logger.info("🔍 Finding optimal number of main clusters using elbow method...")
     n_samples = len(comment_texts)
     max_clusters = min(5, n_samples - 1)  # Can't have more clusters than samples-1
     
     if max_clusters < 2:
-        print(f"⚠️  Only {n_samples} samples - using 1 cluster")
+        logger.warning(f"⚠️  Only {n_samples} samples - using 1 cluster")
         optimal_k = 1
         wcss = []
     else:
@@ -602,7 +608,7 @@ def main():
     if wcss:
         plot_elbow_curve(wcss, k_range, optimal_k, output_dir, prefix="Main ")
     
-    print(f"\n✅ Optimal number of main clusters: {optimal_k}")
+    logger.info(f"✅ Optimal number of main clusters: {optimal_k}")
     
     # Perform main clustering
     if optimal_k == 1:
@@ -623,12 +629,12 @@ def main():
         plt.savefig(os.path.join(output_dir, 'main_dendrogram.png'), dpi=300, bbox_inches='tight')
         plt.close()
     else:
-        print("⚠️  Skipping dendrogram creation - only one cluster")
+        logger.warning("⚠️  Skipping dendrogram creation - only one cluster")
     
     # Perform recursive clustering on each main cluster
     clustering_results = []
     for cluster_id in range(optimal_k):
-        print(f"\n🔍 Analyzing main cluster {cluster_id}...")
+        logger.info(f"🔍 Analyzing main cluster {cluster_id}...")
         result = recursive_clustering(embeddings, processed_entries, main_labels, 
                                     cluster_id, output_dir)
         clustering_results.append(result)
@@ -647,35 +653,61 @@ def main():
     # Generate cluster descriptions using OpenAI
     if all([parse_cluster_report, generate_cluster_descriptions, save_cluster_descriptions]):
         try:
-            print(f"\n🤖 Generating cluster descriptions using OpenAI...")
+            logger.info(f"🤖 Generating cluster descriptions using OpenAI...")
             report_path = os.path.join(output_dir, 'hierarchical_cluster_report.txt')
             clusters = parse_cluster_report(report_path)
             descriptions = generate_cluster_descriptions(clusters)
             descriptions_path = os.path.join(output_dir, 'cluster_descriptions.json')
             save_cluster_descriptions(descriptions, descriptions_path)
-            print(f"✅ Cluster descriptions saved to: {descriptions_path}")
+            logger.info(f"✅ Cluster descriptions saved to: {descriptions_path}")
         except Exception as e:
-            print(f"⚠️  Could not generate cluster descriptions: {e}")
+            logger.warning(f"⚠️  Could not generate cluster descriptions: {e}")
             descriptions_path = None
     else:
-        print(f"⚠️  Cluster descriptions module not available")
+        logger.warning(f"⚠️  Cluster descriptions module not available")
         descriptions_path = None
     
     # Summary statistics
     total_clusters = len(clustering_results)
     total_subclusters = sum(len(r['subclusters']) for r in clustering_results)
     
-    print(f"\n✅ Hierarchical clustering complete!")
-    print(f"📊 Created {total_clusters} main clusters")
-    print(f"📊 Created {total_subclusters} subclusters")
-    print(f"📁 Output files:")
-    print(f"   - {os.path.join(output_dir, 'main_elbow_curve.png')}")
-    print(f"   - {os.path.join(output_dir, 'main_dendrogram.png')}")
-    print(f"   - {os.path.join(output_dir, 'hierarchical_clusters_visualization.png')}")
-    print(f"   - {os.path.join(output_dir, 'hierarchical_cluster_report.txt')}")
+    logger.info(f"✅ Hierarchical clustering complete!")
+    logger.info(f"📊 Created {total_clusters} main clusters")
+    logger.info(f"📊 Created {total_subclusters} subclusters")
+    logger.info(f"📁 Output files:")
+    logger.info(f"   - {os.path.join(output_dir, 'main_elbow_curve.png')}")
+    logger.info(f"   - {os.path.join(output_dir, 'main_dendrogram.png')}")
+    logger.info(f"   - {os.path.join(output_dir, 'hierarchical_clusters_visualization.png')}")
+    logger.info(f"   - {os.path.join(output_dir, 'hierarchical_cluster_report.txt')}")
     if descriptions_path:
-        print(f"   - {descriptions_path}")
-    print(f"   - {input_file} (updated with cluster IDs)")
+        logger.info(f"   - {descriptions_path}")
+    logger.info(f"   - {input_file} (updated with cluster IDs)")
+    
+    return output_dir
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Hierarchical clustering with elbow method')
+    parser.add_argument('--input', type=str, help='Path to lookup table JSON file')
+    parser.add_argument('--model', type=str, default='sentence-transformers/all-mpnet-base-v2',
+                       help='Sentence transformer model to use')
+    parser.add_argument('--output_dir', type=str, help='Output directory')
+    parser.add_argument('--sample', type=int, help='Sample N entries for testing (default: use all)')
+    
+    args = parser.parse_args()
+    
+    # Standalone runs have no pipeline logging configured, so print to the console
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    # Find input file
+    input_file = args.input
+    if input_file is None:
+        input_file = find_most_recent_lookup_table()
+        if input_file is None:
+            logger.error("❌ Could not find lookup table file. Please specify with --input")
+            return
+    
+    run_hierarchical_clustering(input_file, args.output_dir, args.model, args.sample)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
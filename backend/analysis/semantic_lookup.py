@@ -510,7 +510,7 @@ def update_lookup_table_with_clusters(input_file: str, processed_entries: List[D
         # Save the updated lookup table back to the original file
         # This ensures cluster_id is added to the main lookup table
         with open(input_file, 'w') as f:
-            json.dump(original_lookup_table, f, indent=2)
+            json.dump(original_lookup_table, f, separators=(',', ':'))
         
         coords_msg = " and PCA coordinates" if pca_coordinates is not None else ""
         subcluster_msg = " (with subclusters)" if subcluster_labels is not None else ""
@@ -17,8 +17,24 @@ import os
 import json
 import argparse
 import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Optional
 
+from backend.utils.common import sibling_path
+
+# Above this many quoted entries, matching runs in a process pool. Fresh workers first
+# import the backend package (several seconds), which only pays off on very large tables
+PARALLEL_VERIFY_THRESHOLD = 100000
+PARALLEL_VERIFY_CHUNKSIZE = 64
+
+# Verification can run on a pipeline worker thread next to other threads and after
+# clustering loaded its model, so pool workers start fresh instead of being forked
+VERIFY_POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+SENTENCE_END_PATTERN = re.compile(r'[.!?]')
+
 def clean_for_comparison(text: str) -> str:
     """
     Clean text for comparison purposes by normalizing whitespace and punctuation.
@@ -33,7 +49,7 @@ def clean_for_comparison(text: str) -> str:
         return ""
     
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_PATTERN.sub(' ', text)
     
     # Normalize common punctuation variations
     text = text.replace(''', "'").replace(''', "'")
@@ -72,17 +88,17 @@ def find_quote_in_text(quote: str, full_text: str) -> Tuple[bool, Optional[str],
     if not quote or not full_text:
         return False, None, None
     
-    # Try exact match first
-    if quote in full_text:
-        position = full_text.find(quote)
+    # Try exact match first; find() both tests and locates in a single scan
+    position = full_text.find(quote)
+    if position != -1:
         return True, quote, position
     
     # Normalize and try again
     normalized_quote = normalize_quotes(quote)
     normalized_text = normalize_quotes(full_text)
     
-    if normalized_quote in normalized_text:
-        position = normalized_text.find(normalized_quote)
+    position = normalized_text.find(normalized_quote)
+    if position != -1:
         return True, normalized_quote, position
     
     # Clean for more flexible comparison
@@ -91,8 +107,8 @@ def find_quote_in_text(quote: str, full_text: str) -> Tuple[bool, Optional[str],
     
     # Try a more flexible match
     if len(clean_quote) > 20:  # Only for substantial quotes
-        if clean_quote in clean_text:
-            position = clean_text.find(clean_quote)
+        position = clean_text.find(clean_quote)
+        if position != -1:
             # Extract the matching section from the original text
             approx_start = max(0, position - 10)
             approx_end = min(len(clean_text), position + len(clean_quote) + 10)
@@ -103,7 +119,9 @@ def find_quote_in_text(quote: str, full_text: str) -> Tuple[bool, Optional[str],
     # Check if at least 80% of the words in the quote appear together in the text
     quote_words = set(clean_quote.split())
     if len(quote_words) > 5:  # Only for quotes with several words
-        text_chunks = [clean_for_comparison(chunk) for chunk in re.split(r'[.!?]', full_text)]
+        # Split the already cleaned text rather than cleaning every sentence again;
+        # cleaning never adds or removes sentence punctuation
+        text_chunks = [chunk.strip() for chunk in SENTENCE_END_PATTERN.split(clean_text)]
         
         for i, chunk in enumerate(text_chunks):
             chunk_words = set(chunk.split())
@@ -153,24 +171,39 @@ def verify_lookup_quotes(lookup_table_file: str, output_file: Optional[str] = No
         "problematic_quotes": []
     }
     
-    # Verify each lookup entry
+    # Collect the entries that have a quote to check
+    quoted_entries = []
     for i, entry in enumerate(lookup_table):
-        if i % 10 == 0:
-            print(f"Verifying lookup entry {i+1}/{len(lookup_table)}...")
-        
         # Skip entries without quotes or text
         if not entry.get("key_quote") or not entry.get("truncated_text"):
             continue
         
-        results["entries_with_quotes"] += 1
-        
         # Get the key quote and truncated text
         quote = entry.get("key_quote", "").strip()
         truncated_text = entry.get("truncated_text", "").strip()
-        
-        # Verify the quote
-        found_exact, match_text, position = find_quote_in_text(quote, truncated_text)
-        
+        quoted_entries.append((i, entry, quote, truncated_text))
+    
+    results["entries_with_quotes"] = len(quoted_entries)
+    quotes = [quote for _, _, quote, _ in quoted_entries]
+    texts = [truncated_text for _, _, _, truncated_text in quoted_entries]
+    
+    # Matching is pure-Python string work, so large tables fan out over processes
+    # when more than one CPU is available to run them
+    workers = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+    if len(quoted_entries) > PARALLEL_VERIFY_THRESHOLD and workers > 1:
+        print(f"Verifying {len(quoted_entries)} quotes across {workers} processes...")
+        mp_context = multiprocessing.get_context(VERIFY_POOL_START_METHOD)
+        if VERIFY_POOL_START_METHOD == 'forkserver':
+            # Import this module once in the fork server rather than once per worker
+            mp_context.set_forkserver_preload([__name__])
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+            matches = list(pool.map(find_quote_in_text, quotes, texts, chunksize=PARALLEL_VERIFY_CHUNKSIZE))
+    else:
+        print(f"Verifying {len(quoted_entries)} quotes...")
+        matches = [find_quote_in_text(quote, truncated_text) for quote, truncated_text in zip(quotes, texts)]
+    
+    # Tally each verified entry
+    for (i, entry, quote, truncated_text), (found_exact, match_text, position) in zip(quoted_entries, matches):
         if found_exact:
             results["quotes_found_exact"] += 1
         elif match_text:
@@ -327,7 +360,7 @@ def main():
         output_file = args.output
     
     # Generate text report path based on JSON output path
-    text_report_file = output_file.replace('.json', '.txt') if output_file.endswith('.json') else output_file + '.txt'
+    text_report_file = sibling_path(output_file, '', '.txt') if output_file.endswith('.json') else output_file + '.txt'
     
     # Verify quotes
     verify_lookup_quotes(args.input, output_file, text_report_file)
@@ -34,10 +34,13 @@ class FileConfig:
 class AttachmentConfig:
     """Attachment processing configuration."""
     retries: int = 1
+    concurrency: int = 8
     
     def __post_init__(self):
         if self.retries < 0:
             raise ValueError('Retries cannot be negative')
+        if self.concurrency <= 0:
+            raise ValueError('Concurrency must be positive')
 
 
 @dataclass
@@ -391,17 +391,21 @@ def download_all_attachments(comments_data, output_dir: str):
         print(f"Downloaded {downloaded} attachments successfully.")
     return comments_data
 
-def read_comments_from_csv(csv_file_path: str, output_dir: str, limit: Optional[int] = None):
+def read_comments_from_csv(csv_file_path: str, output_dir: Optional[str], limit: Optional[int] = None,
+                           return_inline: bool = False, skip_first_row: bool = True):
     """
     Read comments from a CSV file and save them to a JSON file.
     
     Args:
         csv_file_path: Path to the CSV file
-        output_dir: Directory to save the output JSON file
+        output_dir: Directory to save the output JSON file (unused when return_inline is set)
         limit: Maximum number of comments to process
+        return_inline: Return the list of comments instead of writing raw_data.json
+        skip_first_row: Drop the first data row, which is not a real comment in regulations.gov
+            exports; pass False for CSVs that have already been filtered
     
     Returns:
-        Path to the output JSON file
+        Path to the output JSON file, or the list of comments if return_inline is set
     """
     import pandas as pd
     from pathlib import Path
@@ -418,7 +422,8 @@ def read_comments_from_csv(csv_file_path: str, output_dir: str, limit: Optional[
         df = pd.read_csv(csv_file_path, quoting=csv.QUOTE_NONE, on_bad_lines='skip')
     
     # Skip the second row (first data row) which is not a real comment
-    df = df.iloc[1:].reset_index(drop=True)
+    if skip_first_row:
+        df = df.iloc[1:].reset_index(drop=True)
     
     # Apply limit if specified
     if limit is not None:
@@ -486,10 +491,14 @@ def read_comments_from_csv(csv_file_path: str, output_dir: str, limit: Optional[
         
         comments.append(comment)
     
+    if return_inline:
+        print(f"Read {len(comments)} comments from {csv_file_path}")
+        return comments
+    
     # Save comments to a JSON file
     output_file = os.path.join(output_dir, "raw_data.json")
     with open(output_file, 'w') as f:
-        json.dump(comments, f, indent=2)
+        json.dump(comments, f, separators=(',', ':'))
     
     print(f"Saved {len(comments)} comments to {output_file}")
     
@@ -17,6 +17,7 @@ import json
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from pathlib import Path
 
@@ -30,6 +31,7 @@ from backend.utils import (
     FileManager,
     FileOperationError,
     ConfigurationError,
+    sibling_path,
 )
 from backend.utils.validate_pipeline_output import validate_pipeline_output, print_validation_summary
 
@@ -114,26 +116,29 @@ def main():
             
             # Save updated data back
             with open(raw_data_file, 'w') as f:
-                json.dump(updated_data, f, indent=2)
+                json.dump(updated_data, f, separators=(',', ':'))
             
             # Run attachment analysis
             attachments_dir = os.path.join(args.output_dir, "attachments")
             if os.path.exists(attachments_dir):
                 logger.info(f"Analyzing attachment text extraction...")
                 
+                # -u so the child's prints reach the pipe line by line
                 analyze_cmd = [
-                    sys.executable,
+                    sys.executable, '-u',
                     os.path.join(os.path.dirname(__file__), 'fetch', 'analyze_attachments.py'),
                     '--results_dir', attachments_dir
                 ]
                 
-                result = subprocess.run(analyze_cmd, capture_output=True, text=True)
-                if result.returncode == 0:
+                # Log output as it arrives instead of buffering all of it until exit
+                with subprocess.Popen(analyze_cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                      text=True, bufsize=1) as proc:
+                    for line in proc.stdout:
+                        logger.info(line.rstrip())
+                if proc.returncode == 0:
                     logger.info("✅ Attachment analysis complete")
-                    logger.info(result.stdout)
                 else:
                     logger.error("❌ Attachment analysis failed")
-                    logger.error(result.stderr)
             
             # Reload the data with attachment text
             with open(raw_data_file, 'r') as f:
@@ -155,7 +160,7 @@ def main():
         
         # Save lookup table
         with open(lookup_table_path, 'w') as f:
-            json.dump(lookup_table, f, indent=2)
+            json.dump(lookup_table, f, separators=(',', ':'))
             
         logger.info(f"✅ Lookup table saved to {lookup_table_path}")
         
@@ -189,7 +194,7 @@ def main():
             
             # Save analyzed lookup table back to the original file
             with open(lookup_table_path, 'w') as f:
-                json.dump(analyzed_lookup_table, f, indent=2)
+                json.dump(analyzed_lookup_table, f, separators=(',', ':'))
             
             logger.info(f"✅ Analysis complete, saved to {lookup_table_path}")
         else:
@@ -201,65 +206,68 @@ def main():
             
             logger.info(f"Running hierarchical clustering on {unique_texts} entries")
             
-            # Run clustering
-            
-            # Get absolute path to the hierarchical_clustering script
-            script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            clustering_script = os.path.join(script_dir, 'backend', 'analysis', 'hierarchical_clustering.py')
-            
-            clustering_cmd = [
-                sys.executable, 
-                clustering_script,
-                '--input', lookup_table_path,
-                '--output_dir', args.output_dir
-            ]
-            
-            result = subprocess.run(clustering_cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
+            # Run clustering in-process; imported here so runs with --skip_clustering
+            # never pay for loading the embedding/ML stack
+            try:
+                from backend.analysis.hierarchical_clustering import run_hierarchical_clustering
+                run_hierarchical_clustering(str(lookup_table_path), args.output_dir)
                 logger.info("✅ Clustering complete")
-                logger.info(result.stdout)
-            else:
-                logger.error("❌ Clustering failed")
-                logger.error(result.stderr)
+            except Exception as e:
+                logger.error(f"❌ Clustering failed: {e}")
         elif unique_texts < 2:
             logger.info(f"\n=== STEP 5: Skipping Clustering (too few entries: {unique_texts}) ===")
         else:
             logger.info(f"\n=== STEP 5: Skipping Clustering ===")
         
-        # Step 6: Quote verification (always run if analysis was performed)
-        if not args.skip_analysis and unique_texts > 0:
-            logger.info(f"\n=== STEP 6: Quote Verification ===")
+        # Steps 6 and 7 only read the finished outputs and write disjoint files,
+        # so quote verification runs on a worker thread while validation proceeds
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            verification_future = None
+            
+            # Step 6: Quote verification (always run if analysis was performed)
+            if not args.skip_analysis and unique_texts > 0:
+                logger.info(f"\n=== STEP 6: Quote Verification ===")
+                
+                # Use the lookup table path for verification  
+                verification_output = sibling_path(lookup_table_path, '_quote_verification')
+                text_report_output = sibling_path(lookup_table_path, '_quote_verification', '.txt')
+                
+                logger.info(f"Verifying quotes in {lookup_table_path}...")
+                verification_future = executor.submit(
+                    verify_lookup_quotes, str(lookup_table_path), verification_output, text_report_output
+                )
             
-            # Run quote verification
+            # Step 7: Validate output
+            logger.info(f"\n=== STEP 7: Validating Pipeline Output ===")
             
-            # Use the lookup table path for verification  
-            verification_output = str(lookup_table_path).replace('.json', '_quote_verification.json')
+            validation_future = executor.submit(
+                validate_pipeline_output,
+                csv_file=args.csv,
+                raw_data_file=raw_data_path,
+                data_file=None,  # No data.json created in pipeline anymore
+                lookup_table_file=lookup_table_path,
+                skip_analysis_validation=args.skip_analysis,
+                skip_count_validation=bool(args.limit)  # Skip count validation if using --limit
+            )
             
-            logger.info(f"Verifying quotes in {lookup_table_path}...")
-            verification_results = verify_lookup_quotes(str(lookup_table_path), verification_output)
+            if verification_future is not None:
+                try:
+                    verification_results = verification_future.result()
+                except Exception as e:
+                    logger.error(f"❌ Quote verification failed: {e}")
+                    verification_results = None
+                
+                if verification_results:
+                    logger.info(f"✅ Quote verification complete")
+                    logger.info(f"   Verification rate: {verification_results.get('verification_rate', 0)}%")
+                    logger.info(f"   Exact matches: {verification_results.get('exact_match_rate', 0)}%")
+                    logger.info(f"   Quotes not found: {verification_results.get('quotes_not_found', 0)} ({round(verification_results.get('quotes_not_found', 0) / max(1, verification_results.get('entries_with_quotes', 1)) * 100, 1)}%)")
+                    logger.info(f"   Results saved to: {verification_output}")
+                    logger.info(f"   Text report: {text_report_output}")
+                else:
+                    logger.error("❌ Quote verification failed")
             
-            if verification_results:
-                logger.info(f"✅ Quote verification complete")
-                logger.info(f"   Verification rate: {verification_results.get('verification_rate', 0)}%")
-                logger.info(f"   Exact matches: {verification_results.get('exact_match_rate', 0)}%")
-                logger.info(f"   Quotes not found: {verification_results.get('quotes_not_found', 0)} ({round(verification_results.get('quotes_not_found', 0) / max(1, verification_results.get('entries_with_quotes', 1)) * 100, 1)}%)")
-                logger.info(f"   Results saved to: {verification_output}")
-                logger.info(f"   Text report: {verification_output.replace('.json', '.txt')}")
-            else:
-                logger.error("❌ Quote verification failed")
-        
-        # Step 7: Validate output
-        logger.info(f"\n=== STEP 7: Validating Pipeline Output ===")
-        
-        validation_results = validate_pipeline_output(
-            csv_file=args.csv,
-            raw_data_file=raw_data_path,
-            data_file=None,  # No data.json created in pipeline anymore
-            lookup_table_file=lookup_table_path,
-            skip_analysis_validation=args.skip_analysis,
-            skip_count_validation=bool(args.limit)  # Skip count validation if using --limit
-        )
+            validation_results = validation_future.result()
         
         # Print validation summary
         print_validation_summary(validation_results)
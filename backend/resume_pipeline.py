@@ -10,31 +10,67 @@ Usage:
 python resume_pipeline.py --csv comments.csv [--raw_data raw_data.json] [--lookup_table lookup_table.json] [--truncate 500]
 """
 
-import json
 import os
 import argparse
+import bisect
 import logging
 import csv
-import subprocess
 import sys
 import shutil
-from typing import List, Dict, Any, Set, Optional
-import pandas as pd
+import tempfile
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Set, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to parsing whole files
+    ijson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; fall back to pandas / csv module parsing
+    pa = None
 
 # Add the parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import our existing modules
 from backend.fetch.fetch_comments import read_comments_from_csv, download_all_attachments
-from backend.analysis.create_lookup_table import normalize_text_for_dedup, extract_and_combine_text
-from backend.analysis.analyze_lookup_table import analyze_lookup_table_batch, CommentAnalyzer
+from backend.analysis.create_lookup_table import normalize_text_for_dedup, extract_and_combine_text, dedup_key
+from backend.analysis.analyze_lookup_table import analyze_lookup_table_batch, count_analyzed_entries, CommentAnalyzer
 from backend.analysis.verify_lookup_quotes import verify_lookup_quotes
 from backend.utils.retry_gemini_attachments import extract_text_with_gemini
+from backend.utils.common import sibling_path, load_json_mapped, dump_json_compact, append_json_array, clone_file, file_sha256
 from backend.config import config
 
 # Initial logger setup (will be reconfigured with file handler in main)
 logger = logging.getLogger(__name__)
 
+# Below this many new comments, process pool start-up costs more than it saves
+PARALLEL_NORMALIZE_THRESHOLD = 1000
+PARALLEL_NORMALIZE_CHUNKSIZE = 256
+
+# Above this many changed lookup entries a full sort beats per-entry binary insertion
+RESORT_INSORT_THRESHOLD = 1000
+
+# Extractions keyed by attachment content, shared by identical files across comments.
+# Lives beside attachments/, not inside it: every entry under attachments/ is
+# treated as a comment ID directory by the attachment walkers
+EXTRACTION_CACHE_DIRNAME = '.extraction_cache'
+_extraction_locks: Dict[str, threading.Lock] = {}
+_extraction_locks_guard = threading.Lock()
+
+# Sidecar next to the comments CSV holding its comment IDs from the last scan
+CSV_ID_CACHE_SUFFIX = '.ids.cache'
+
+# pyarrow CSV read block size; larger than the 1 MiB default to cut per-block overhead on big exports
+CSV_BLOCK_SIZE = 8 << 20
+
 def setup_logging(output_dir: str):
     """Set up logging with file handler in the output directory."""
     log_file = os.path.join(output_dir, 'resume_pipeline.log')
@@ -48,16 +84,18 @@ def setup_logging(output_dir: str):
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_file),
+            logging.FileHandler(log_file, encoding='utf-8', errors='replace'),
             logging.StreamHandler()
         ],
         force=True  # Override existing configuration
     )
     logger.info(f"📝 Logging to: {log_file}")
 
-def validate_truncation_consistency(lookup_table_file: str, requested_truncation: Optional[int]) -> int:
+def validate_truncation_consistency(lookup_table_file: str, requested_truncation: Optional[int],
+                                    lookup_table: Optional[List[Dict[str, Any]]] = None) -> int:
     """
     Validate that the requested truncation level matches the existing lookup table.
+    Pass lookup_table when it is already loaded to avoid parsing the file again.
     Returns the validated truncation level.
     """
     logger.info(f"🔍 Validating truncation consistency...")
@@ -67,8 +105,8 @@ def validate_truncation_consistency(lookup_table_file: str, requested_truncation
         return requested_truncation
     
     try:
-        with open(lookup_table_file, 'r') as f:
-            lookup_table = json.load(f)
+        if lookup_table is None:
+            lookup_table = load_json_mapped(lookup_table_file)
         
         if not lookup_table:
             logger.info(f"Empty lookup table, using requested truncation: {requested_truncation}")
@@ -102,50 +140,119 @@ def validate_truncation_consistency(lookup_table_file: str, requested_truncation
         logger.error(f"Error validating truncation: {e}")
         raise
 
-def load_comment_ids_from_csv(csv_file: str, limit: Optional[int] = None) -> Set[str]:
-    """Load comment IDs from CSV file."""
-    logger.info(f"📖 Loading comment IDs from CSV: {csv_file}")
-    if limit:
-        logger.info(f"   Limiting to first {limit} rows")
+def read_csv_header(csv_file: str) -> List[str]:
+    """Return the column names from the first line of a CSV file."""
+    with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f), [])
+
+def find_csv_id_column(columns) -> Optional[str]:
+    """Pick the comment ID column, preferring 'Comment ID' over 'Document ID'."""
+    for column in ('Comment ID', 'Document ID'):
+        if column in columns:
+            return column
+    return None
+
+def read_csv_as_strings(csv_file: str, include_columns: Optional[List[str]] = None) -> 'pa.Table':
+    """
+    Read a comments CSV with pyarrow, keeping every value as its original string.
+    Quoted values may span lines; malformed rows are skipped like pandas' on_bad_lines='skip'.
+    """
+    header = read_csv_header(csv_file)
+    return pacsv.read_csv(
+        csv_file,
+        read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True, invalid_row_handler=lambda row: 'skip'),
+        convert_options=pacsv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            include_columns=include_columns or []
+        )
+    )
+
+def write_new_comment_rows(csv_file: str, raw_ids: Set[str], new_comments_csv: str,
+                           limit: Optional[int] = None) -> Tuple[Set[str], List[str]]:
+    """
+    Scan the CSV once, copying rows whose comment ID is not in raw_ids to new_comments_csv.
+    At most limit rows are copied. The first data row is not a real comment (see
+    read_comments_from_csv) and is skipped.
+    Returns (all CSV comment IDs, new comment IDs in CSV order).
+    """
+    logger.info(f"📖 Scanning CSV for new comments: {csv_file}")
+    
+    if pa is not None:
+        # Vectorized read and hash-set filter, keeping values as the original strings
+        table = read_csv_as_strings(csv_file)
+        id_column = find_csv_id_column(table.column_names)
+        if id_column is None:
+            raise ValueError("Neither 'Comment ID' nor 'Document ID' found in CSV columns")
+        
+        table = table.slice(1)
+        ids = table[id_column]
+        has_id = pc.not_equal(ids, '')
+        raw_ids_array = pa.array(list(raw_ids), type=pa.string())
+        new_rows = table.filter(pc.and_(has_id, pc.invert(pc.is_in(ids, value_set=raw_ids_array))))
+        
+        csv_ids = set(pc.unique(ids.filter(has_id)).to_pylist())
+        new_ids = new_rows[id_column].to_pylist()
+        pacsv.write_csv(new_rows.slice(0, limit) if limit else new_rows, new_comments_csv)
+        return csv_ids, new_ids
+    
+    # Comment bodies can exceed the csv module's default 128KB field limit
+    csv.field_size_limit(2**31 - 1)
+    
+    csv_ids = set()
+    new_ids = []
+    with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f_in, \
+         open(new_comments_csv, 'w', encoding='utf-8', newline='') as f_out:
+        reader = csv.reader(f_in)
+        writer = csv.writer(f_out)
+        
+        header = next(reader, [])
+        id_column = find_csv_id_column(header)
+        if id_column is None:
+            raise ValueError("Neither 'Comment ID' nor 'Document ID' found in CSV columns")
+        id_index = header.index(id_column)
+        writer.writerow(header)
+        
+        next(reader, None)
+        for row in reader:
+            if len(row) != len(header) or not row[id_index]:
+                continue
+            comment_id = row[id_index]
+            csv_ids.add(comment_id)
+            if comment_id in raw_ids:
+                continue
+            new_ids.append(comment_id)
+            if not limit or len(new_ids) <= limit:
+                writer.writerow(row)
     
+    return csv_ids, new_ids
+
+def _csv_stat_key(csv_file: str) -> str:
+    """Identify the current version of a file by modification time, size and inode."""
+    st = os.stat(csv_file)
+    return f"{st.st_mtime_ns} {st.st_size} {st.st_ino}"
+
+def load_csv_id_cache(csv_file: str) -> Optional[Set[str]]:
+    """
+    Return the comment IDs cached for csv_file by a previous scan, or None when there
+    is no cache or the CSV has changed since it was written.
+    """
     try:
-        # Try parsing with Python csv module which handles embedded quotes better
-        comment_ids = set()
-        
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for i, row in enumerate(reader):
-                if limit and i >= limit:
-                    break
-                # Try both 'Comment ID' and 'Document ID' columns
-                comment_id = row.get('Comment ID') or row.get('Document ID')
-                if comment_id:
-                    comment_ids.add(comment_id)
-        
-        logger.info(f"✅ Found {len(comment_ids):,} comment IDs in CSV")
-        return comment_ids
-        
-    except Exception as e:
-        logger.error(f"Error loading CSV with csv module: {e}")
-        # Fallback to pandas with error handling
-        try:
-            logger.info("Trying pandas with error recovery...")
-            # Try to read either Comment ID or Document ID column
-            try:
-                df = pd.read_csv(csv_file, usecols=['Comment ID'], on_bad_lines='skip', encoding='utf-8')
-                if limit:
-                    df = df.head(limit)
-                comment_ids = set(df['Comment ID'].astype(str).tolist())
-            except KeyError:
-                df = pd.read_csv(csv_file, usecols=['Document ID'], on_bad_lines='skip', encoding='utf-8')
-                if limit:
-                    df = df.head(limit)
-                comment_ids = set(df['Document ID'].astype(str).tolist())
-            logger.info(f"✅ Found {len(comment_ids):,} comment IDs in CSV (pandas fallback)")
-            return comment_ids
-        except Exception as e2:
-            logger.error(f"All CSV parsing methods failed: {e2}")
-            raise
+        with open(csv_file + CSV_ID_CACHE_SUFFIX, 'r', encoding='utf-8') as f:
+            if f.readline().rstrip('\n') != _csv_stat_key(csv_file):
+                return None
+            return set(f.read().splitlines())
+    except OSError:
+        return None
+
+def save_csv_id_cache(csv_file: str, csv_ids: Set[str]) -> None:
+    """Write csv_ids next to csv_file, stamped with the CSV's current stat key."""
+    try:
+        with open(csv_file + CSV_ID_CACHE_SUFFIX, 'w', encoding='utf-8') as f:
+            f.write(_csv_stat_key(csv_file) + '\n')
+            f.write('\n'.join(sorted(csv_ids)))
+    except OSError as e:
+        logger.warning(f"Could not write CSV ID cache: {e}")
 
 def load_comment_ids_from_raw_data(raw_data_file: str) -> Set[str]:
     """Load comment IDs from raw_data.json file."""
@@ -156,121 +263,147 @@ def load_comment_ids_from_raw_data(raw_data_file: str) -> Set[str]:
     logger.info(f"📖 Loading comment IDs from raw_data: {raw_data_file}")
     
     try:
-        with open(raw_data_file, 'r') as f:
-            raw_data = json.load(f)
+        if ijson is not None:
+            # Stream just the top-level ids rather than building every comment dict
+            with open(raw_data_file, 'rb') as f:
+                comment_ids = set(ijson.items(f, 'item.id'))
+        else:
+            raw_data = load_json_mapped(raw_data_file)
+            comment_ids = set(item['id'] for item in raw_data if 'id' in item)
         
-        comment_ids = set(item['id'] for item in raw_data if 'id' in item)
         logger.info(f"✅ Found {len(comment_ids):,} comment IDs in raw_data")
         return comment_ids
     except Exception as e:
         logger.error(f"Error loading raw_data: {e}")
         raise
 
-def find_new_comment_ids(csv_file: str, raw_data_file: str, limit: Optional[int] = None) -> Set[str]:
-    """Find comment IDs that are in CSV but not in raw_data."""
-    csv_ids = load_comment_ids_from_csv(csv_file, limit=limit)
+def find_new_comment_ids(csv_file: str, raw_data_file: str, new_comments_csv: str,
+                         limit: Optional[int] = None) -> Tuple[Set[str], int]:
+    """
+    Find comment IDs that are in CSV but not in raw_data, writing their CSV rows to
+    new_comments_csv in the same pass. With a limit, only the first limit new comments
+    (in CSV order) are kept.
+    Returns the new IDs and the number of comments already in raw_data.
+    """
     raw_ids = load_comment_ids_from_raw_data(raw_data_file)
     
-    new_ids = csv_ids - raw_ids
+    cached_csv_ids = load_csv_id_cache(csv_file)
+    if cached_csv_ids is not None and cached_csv_ids <= raw_ids:
+        # The CSV has not changed since its IDs were cached and all of them are already
+        # in raw_data, so there are no rows to copy; write just the header
+        logger.info(f"📖 CSV unchanged since last scan and already fully fetched: {csv_file}")
+        with open(new_comments_csv, 'w', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerow(read_csv_header(csv_file))
+        csv_count, new_ids = len(cached_csv_ids), []
+    else:
+        csv_ids, new_ids = write_new_comment_rows(csv_file, raw_ids, new_comments_csv, limit=limit)
+        save_csv_id_cache(csv_file, csv_ids)
+        csv_count = len(csv_ids)
     
     logger.info(f"📊 Comment ID analysis:")
-    if limit:
-        logger.info(f"   CSV file: {len(csv_ids):,} comments (limited to first {limit})")
-    else:
-        logger.info(f"   CSV file: {len(csv_ids):,} comments")
+    logger.info(f"   CSV file: {csv_count:,} comments")
     logger.info(f"   Raw data: {len(raw_ids):,} comments") 
     logger.info(f"   New to fetch: {len(new_ids):,} comments")
     
-    return new_ids
+    # Apply limit to NEW comments only (not total CSV)
+    if limit is not None and limit > 0 and len(new_ids) > limit:
+        logger.info(f"📊 Found {len(new_ids)} new comments, limiting to first {limit}")
+        new_ids = new_ids[:limit]
+    elif limit is not None and limit > 0:
+        logger.info(f"📊 Found {len(new_ids)} new comments (no limiting needed, less than {limit})")
+    
+    return set(new_ids), len(raw_ids)
 
-def fetch_and_append_new_comments(new_comment_ids: Set[str], csv_file: str, 
-                                 raw_data_file: str, output_dir: str) -> str:
+def extract_new_attachment(file_path: str, position: int, total: int, cache_dir: Optional[str] = None) -> str:
     """
-    Fetch new comments (with attachments) and append to raw_data.json.
-    Returns path to updated raw_data.json.
+    Make sure an attachment has an .extracted.txt next to it, calling Gemini if needed.
+    With cache_dir, extractions are also stored there by content hash so identical files
+    attached to other comments (form-letter PDFs) reuse the text instead of being re-sent.
+    Returns the outcome: 'existing', 'cached', 'extracted', 'skipped' or 'failed'.
     """
-    if not new_comment_ids:
-        logger.info("No new comments to fetch")
-        return raw_data_file
+    extracted_path = file_path + '.extracted.txt'
     
-    logger.info(f"🔄 Fetching {len(new_comment_ids):,} new comments with attachments...")
+    # ALWAYS check for existing extraction first and USE IT REGARDLESS OF LENGTH
+    if os.path.exists(extracted_path):
+        try:
+            with open(extracted_path, 'r', encoding='utf-8') as f:
+                existing_text = f.read()
+            logger.info(f"  [{position}/{total}] {os.path.basename(file_path)} - ✅ Using existing extraction ({len(existing_text)} chars)")
+            return 'existing'
+        except Exception as e:
+            logger.warning(f"  Error reading existing extraction: {e}, will re-extract")
     
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
+    if cache_dir is None:
+        return _extract_attachment_text(file_path, extracted_path, position, total)
     
-    # Create a filtered CSV with only new comment IDs
     try:
-        df = pd.read_csv(csv_file, on_bad_lines='skip')
-    except Exception as e:
-        logger.error(f"Error reading CSV with pandas: {e}")
-        logger.info("Trying CSV module instead...")
-        
-        # Use csv module as fallback
-        
-        # Read with csv module and write clean version
-        rows = []
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            header = reader.fieldnames
-            for row in reader:
-                rows.append(row)
-        
-        # Create dataframe from clean data
-        df = pd.DataFrame(rows)
-        logger.info(f"Successfully read {len(df)} rows with csv module")
-    
-    # Try both column names
-    if 'Comment ID' in df.columns:
-        comment_col = 'Comment ID'
-        new_comments_df = df[df['Comment ID'].astype(str).isin(new_comment_ids)]
-    elif 'Document ID' in df.columns:
-        comment_col = 'Document ID'
-        new_comments_df = df[df['Document ID'].astype(str).isin(new_comment_ids)]
-    else:
-        raise ValueError("Neither 'Comment ID' nor 'Document ID' found in CSV columns")
+        content_hash = file_sha256(file_path)
+    except OSError as e:
+        logger.warning(f"  Could not hash {os.path.basename(file_path)}: {e}, extracting without cache")
+        return _extract_attachment_text(file_path, extracted_path, position, total)
+    cache_path = os.path.join(cache_dir, content_hash + '.txt')
+    
+    # Hold a per-content lock so concurrent copies of one file wait for a single extraction
+    with _extraction_locks_guard:
+        content_lock = _extraction_locks.setdefault(content_hash, threading.Lock())
+    with content_lock:
+        if os.path.exists(cache_path):
+            clone_file(cache_path, extracted_path)
+            logger.info(f"  [{position}/{total}] {os.path.basename(file_path)} - ✅ Reused extraction of identical file")
+            return 'cached'
+        
+        outcome = _extract_attachment_text(file_path, extracted_path, position, total)
+        if outcome == 'extracted':
+            clone_file(extracted_path, cache_path)
+        return outcome
+
+def _extract_attachment_text(file_path: str, extracted_path: str, position: int, total: int) -> str:
+    """Extract an attachment with Gemini and save the text to extracted_path."""
+    logger.info(f"  [{position}/{total}] {os.path.basename(file_path)} - extracting...")
     
-    logger.info(f"📊 Filtering CSV:")
-    logger.info(f"   Total rows in CSV: {len(df)}")
-    logger.info(f"   Using column: {comment_col}")
-    logger.info(f"   New comment IDs to find: {len(new_comment_ids)}")
-    logger.info(f"   Matching rows found: {len(new_comments_df)}")
+    try:
+        # Use Gemini extraction 
+        extracted_text = extract_text_with_gemini(file_path, max_retries=config.attachments.retries, timeout=config.llm.timeout)
+        
+        if extracted_text and not extracted_text.startswith('['):
+            # Save extracted text
+            with open(extracted_path, 'w', encoding='utf-8') as f:
+                f.write(extracted_text)
+            logger.info(f"    ✅ Extracted: {len(extracted_text)} chars ({os.path.basename(file_path)})")
+            return 'extracted'
+        
+        logger.info(f"    ⏭️  Skipped: {extracted_text} ({os.path.basename(file_path)})")
+        return 'skipped'
+    except Exception as e:
+        logger.warning(f"    ❌ Failed: {e} ({os.path.basename(file_path)})")
+        return 'failed'
+
+def fetch_and_append_new_comments(new_comment_ids: Set[str], new_comments_csv: str, 
+                                 raw_data_file: str, output_dir: str) -> List[Dict[str, Any]]:
+    """
+    Fetch new comments (with attachments) from the CSV rows written by
+    find_new_comment_ids and append them to raw_data.json.
+    Returns the appended comments, so callers need not read them back.
+    """
+    if not new_comment_ids:
+        logger.info("No new comments to fetch")
+        return []
     
-    if len(new_comments_df) == 0:
-        logger.warning("❌ No matching rows found in CSV!")
-        logger.info(f"   First few CSV IDs: {df[comment_col].astype(str).head().tolist()}")
-        logger.info(f"   New comment IDs: {list(new_comment_ids)}")
-        return raw_data_file
+    logger.info(f"🔄 Fetching {len(new_comment_ids):,} new comments with attachments...")
     
-    # Save filtered CSV
-    temp_csv = os.path.join(output_dir, 'new_comments_temp.csv')
-    new_comments_df.to_csv(temp_csv, index=False)
+    # Ensure output directory exists
+    os.makedirs(output_dir, exist_ok=True)
     
     try:
         # Use existing fetch logic to get comments with attachments
         logger.info(f"Fetching comments from filtered CSV...")
         
-        # Create a temporary directory for the fetch operation
-        temp_output_dir = os.path.join(output_dir, 'temp_fetch')
-        os.makedirs(temp_output_dir, exist_ok=True)
-        
-        # Fetch new comments to a temporary file
-        raw_data_file_from_csv = read_comments_from_csv(temp_csv, temp_output_dir, limit=len(new_comment_ids))
+        # Build the new comments in memory rather than round-tripping them through a temp JSON file
+        new_raw_data = read_comments_from_csv(new_comments_csv, None, return_inline=True, skip_first_row=False)
         
-        # Load the generated raw data
-        with open(raw_data_file_from_csv, 'r') as f:
-            new_raw_data = json.load(f)
-        
-        # Append to existing raw_data or create new one
-        if os.path.exists(raw_data_file):
-            with open(raw_data_file, 'r') as f:
-                existing_raw_data = json.load(f)
-            logger.info(f"Loaded {len(existing_raw_data):,} existing comments from {raw_data_file}")
-        else:
-            existing_raw_data = []
+        if not os.path.exists(raw_data_file):
             logger.info(f"No existing raw_data.json found at {raw_data_file}, creating new file")
         
-        existing_raw_data.extend(new_raw_data)
-        
         # Download attachments for new comments if any have them
         attachments_to_download = []
         for comment in new_raw_data:
@@ -280,17 +413,9 @@ def fetch_and_append_new_comments(new_comment_ids: Set[str], csv_file: str,
         if attachments_to_download:
             logger.info(f"📎 Downloading attachments for {len(attachments_to_download)} new comments...")
             
-            # Download attachments
-            updated_new_data = download_all_attachments(new_raw_data, output_dir)
-            
-            # Update the existing_raw_data with attachment info
-            # Create a mapping of comment IDs to updated comments
-            updated_map = {c['id']: c for c in updated_new_data}
-            
-            # Update existing_raw_data
-            for i, comment in enumerate(existing_raw_data):
-                if comment['id'] in updated_map:
-                    existing_raw_data[i] = updated_map[comment['id']]
+            # Download attachments; comments come back with attachment info filled in,
+            # before anything is appended to raw_data, so no fix-up pass is needed
+            new_raw_data = download_all_attachments(new_raw_data, output_dir)
             
             # Run attachment analysis ONLY on new comment attachments
             # Build a list of attachment paths that belong to NEW comments only
@@ -304,138 +429,103 @@ def fetch_and_append_new_comments(new_comment_ids: Set[str], csv_file: str,
                     if comment_id:
                         comment_attachments_dir = os.path.join(attachments_dir, comment_id)
                         if os.path.exists(comment_attachments_dir):
-                            # Find all attachment files for this comment
-                            for file_name in os.listdir(comment_attachments_dir):
-                                if not file_name.endswith('.extracted.txt'):  # Skip extracted text files themselves
-                                    file_path = os.path.join(comment_attachments_dir, file_name)
-                                    if os.path.isfile(file_path):
+                            # Find all attachment files for this comment; scandir's cached
+                            # file type saves a stat call per file
+                            with os.scandir(comment_attachments_dir) as entries:
+                                for entry in entries:
+                                    if not entry.name.endswith('.extracted.txt') and entry.is_file():  # Skip extracted text files themselves
                                         # Always add to list - we'll check for existing extraction later
-                                        new_attachment_paths.append(file_path)
+                                        new_attachment_paths.append(entry.path)
                 
                 if new_attachment_paths:
                     logger.info(f"📎 Processing {len(new_attachment_paths)} attachment files from new comments...")
                     
                     try:
-                        
-                        processed = 0
-                        existing_used = 0
-                        newly_extracted = 0
-                        skipped = 0
-                        failed = 0
-                        
-                        for i, file_path in enumerate(new_attachment_paths, 1):
-                            extracted_path = file_path + '.extracted.txt'
-                            
-                            # ALWAYS check for existing extraction first and USE IT REGARDLESS OF LENGTH
-                            if os.path.exists(extracted_path):
-                                try:
-                                    with open(extracted_path, 'r', encoding='utf-8') as f:
-                                        existing_text = f.read()
-                                    logger.info(f"  [{i}/{len(new_attachment_paths)}] {os.path.basename(file_path)} - ✅ Using existing extraction ({len(existing_text)} chars)")
-                                    processed += 1
-                                    existing_used += 1
-                                    continue
-                                except Exception as e:
-                                    logger.warning(f"  Error reading existing extraction: {e}, will re-extract")
-                                
-                            # Only extract if no existing extraction found
-                            logger.info(f"  [{i}/{len(new_attachment_paths)}] {os.path.basename(file_path)} - extracting...")
-                            
-                            try:
-                                # Use Gemini extraction 
-                                extracted_text = extract_text_with_gemini(file_path, max_retries=config.attachments.retries, timeout=config.llm.timeout)
-                                
-                                if extracted_text and not extracted_text.startswith('['):
-                                    # Save extracted text
-                                    with open(extracted_path, 'w', encoding='utf-8') as f:
-                                        f.write(extracted_text)
-                                    processed += 1
-                                    newly_extracted += 1
-                                    logger.info(f"    ✅ Extracted: {len(extracted_text)} chars")
-                                else:
-                                    skipped += 1
-                                    logger.info(f"    ⏭️  Skipped: {extracted_text}")
-                                    
-                            except Exception as e:
-                                failed += 1
-                                logger.warning(f"    ❌ Failed: {e}")
+                        # Each extraction is a blocking Gemini request, so run several at once
+                        total = len(new_attachment_paths)
+                        cache_dir = os.path.join(output_dir, EXTRACTION_CACHE_DIRNAME)
+                        os.makedirs(cache_dir, exist_ok=True)
+                        with ThreadPoolExecutor(max_workers=config.attachments.concurrency) as executor:
+                            outcomes = Counter(executor.map(
+                                partial(extract_new_attachment, cache_dir=cache_dir),
+                                new_attachment_paths,
+                                range(1, total + 1),
+                                [total] * total
+                            ))
                         
                         logger.info(f"✅ Processing complete:")
-                        logger.info(f"   Total processed: {processed}")
-                        logger.info(f"   Existing extractions used: {existing_used}")
-                        logger.info(f"   Newly extracted: {newly_extracted}")
-                        logger.info(f"   Failed: {failed}")
-                        logger.info(f"   Skipped: {skipped}")
+                        logger.info(f"   Total processed: {outcomes['existing'] + outcomes['cached'] + outcomes['extracted']}")
+                        logger.info(f"   Existing extractions used: {outcomes['existing']}")
+                        logger.info(f"   Reused from identical files: {outcomes['cached']}")
+                        logger.info(f"   Newly extracted: {outcomes['extracted']}")
+                        logger.info(f"   Failed: {outcomes['failed']}")
+                        logger.info(f"   Skipped: {outcomes['skipped']}")
                         
                     except Exception as e:
                         logger.warning(f"⚠️  Attachment processing failed: {e}")
                 else:
                     logger.info("✅ No attachments found for new comments")
         
-        # Save updated raw_data back to the original location
-        with open(raw_data_file, 'w') as f:
-            json.dump(existing_raw_data, f, indent=2)
-        
-        # Clean up temporary files
-        os.remove(raw_data_file_from_csv)
-        os.rmdir(temp_output_dir)
+        # Append the new comments to raw_data in place; existing comments are never re-read or re-written
+        append_json_array(new_raw_data, raw_data_file)
         
         logger.info(f"✅ Appended {len(new_raw_data):,} new comments to raw_data")
-        logger.info(f"✅ Total comments in raw_data: {len(existing_raw_data):,}")
-        
-        # Cleanup temp file
-        os.remove(temp_csv)
         
-        return raw_data_file
+        return new_raw_data
         
     except Exception as e:
         logger.error(f"Error fetching new comments: {e}")
-        # Cleanup temp file
-        if os.path.exists(temp_csv):
-            os.remove(temp_csv)
         raise
 
-def update_lookup_table_with_new_comments(new_comment_ids: Set[str], raw_data_file: str, 
-                                        lookup_table_file: str, truncation: Optional[int]) -> str:
+def _normalize_new_comment(comment_data: Dict[str, Any], truncation: Optional[int]) -> Dict[str, Any]:
     """
-    Update lookup table with new comments, adding them to existing patterns or creating new entries.
-    Returns path to updated lookup table.
+    Extract, truncate and normalize the text of a single comment.
+    Runs inside worker processes, so it must stay a module-level function.
     """
-    if not new_comment_ids:
-        logger.info("No new comments to add to lookup table")
-        return lookup_table_file
-    
-    logger.info(f"🔄 Updating lookup table with {len(new_comment_ids):,} new comments...")
-    
-    # Load existing lookup table or create empty one
-    if os.path.exists(lookup_table_file):
-        with open(lookup_table_file, 'r') as f:
-            lookup_table = json.load(f)
-        logger.info(f"Loaded existing lookup table with {len(lookup_table)} entries")
-    else:
-        lookup_table = []
-        logger.info("Creating new lookup table")
-    
-    # Load raw data to get the new comments
-    with open(raw_data_file, 'r') as f:
-        raw_data = json.load(f)
-    
-    # Filter to only new comments
-    new_comments = [item for item in raw_data if item['id'] in new_comment_ids]
-    logger.info(f"Processing {len(new_comments)} new comments for lookup table")
-    
-    # Create mapping of normalized text to existing lookup entries
-    existing_text_map = {}
-    for i, entry in enumerate(lookup_table):
-        # Normalize the existing truncated text
-        normalized = normalize_text_for_dedup(entry['truncated_text'])
-        existing_text_map[normalized] = i
+    comment_id = comment_data.get('id', 'unknown')
+    try:
+        text_result = extract_and_combine_text(comment_data, truncation)
+        truncated_text = text_result['truncated_text']
+        # Measure both lengths here, in the worker, so the lookup entry is built from stored values
+        full_text = text_result.get('full_text') or ''
+        return {
+            'id': comment_id,
+            'truncated_text': truncated_text,
+            'text_source': text_result['text_source'],
+            'comment_text': text_result.get('comment_text', ''),
+            'attachment_text': text_result.get('attachment_text', ''),
+            'full_text_length': len(full_text),
+            'truncated_text_length': len(truncated_text),
+            'normalized_text': normalize_text_for_dedup(truncated_text) if truncated_text.strip() else '',
+            'error': None
+        }
+    except Exception as e:
+        return {'id': comment_id, 'error': str(e)}
+
+def normalize_new_comments(new_comments: List[Dict[str, Any]], truncation: Optional[int]) -> List[Dict[str, Any]]:
+    """
+    Normalize text for all new comments, fanning out over a process pool for large batches.
+    Results are returned in the same order as new_comments.
+    """
+    normalize_one = partial(_normalize_new_comment, truncation=truncation)
     
-    # Process each new comment
-    added_to_existing = 0
-    new_entries_created = 0
+    if len(new_comments) <= PARALLEL_NORMALIZE_THRESHOLD:
+        return [normalize_one(comment_data) for comment_data in new_comments]
     
-    # Find the highest existing lookup ID to avoid conflicts
+    logger.info(f"Normalizing {len(new_comments):,} new comments across {os.cpu_count()} processes")
+    with ProcessPoolExecutor() as pool:
+        return list(pool.map(normalize_one, new_comments, chunksize=PARALLEL_NORMALIZE_CHUNKSIZE))
+
+def _dedup_length_key(text: str) -> int:
+    """
+    Count the non-whitespace characters of lowercased text.
+    normalize_text_for_dedup only lowercases, collapses whitespace and swaps single
+    characters, so texts that normalize equally always share this key.
+    """
+    return sum(map(len, text.lower().split()))
+
+def find_next_lookup_id(lookup_table: List[Dict[str, Any]]) -> int:
+    """Scan the lookup table for the highest lookup_XXXXXX number and return the one after it."""
     max_id = 0
     for entry in lookup_table:
         lookup_id = entry.get('lookup_id', 'lookup_000000')
@@ -445,83 +535,163 @@ def update_lookup_table_with_new_comments(new_comment_ids: Set[str], raw_data_fi
             max_id = max(max_id, id_num)
         except (IndexError, ValueError):
             continue
-    next_lookup_id = max_id + 1
+    return max_id + 1
+
+def add_comments_to_lookup_table(lookup_table: List[Dict[str, Any]], 
+                                 normalized_comments: List[Dict[str, Any]]) -> Tuple[int, int, Set[int]]:
+    """
+    Add normalized comments to the lookup table in place, attaching each one to an
+    existing pattern or creating a new entry.
+    Returns (added_to_existing, new_entries_created, changed_indices), where
+    changed_indices are the positions of entries that were modified or appended.
+    """
+    # Mapping of dedup key to lookup entries. Entries carry the key from when they were
+    # created; legacy entries without one are bucketed by a normalization-invariant
+    # length so only those that could collide with a new comment ever get normalized
+    existing_text_map = {}
+    entries_by_length = defaultdict(list)
+    for i, entry in enumerate(lookup_table):
+        key = entry.get('dedup_key')
+        if key is not None:
+            existing_text_map[key] = i
+        else:
+            entries_by_length[_dedup_length_key(entry['truncated_text'])].append(i)
+    loaded_lengths = set()
     
-    for comment_data in new_comments:
-        try:
-            comment_id = comment_data['id']
-            
-            # Extract and normalize text for this comment
-            text_result = extract_and_combine_text(comment_data, truncation)
-            truncated_text = text_result['truncated_text']
-            
-            if not truncated_text.strip():
-                logger.warning(f"Comment {comment_id} has empty text, skipping")
-                continue
-            
-            normalized_text = normalize_text_for_dedup(truncated_text)
-            
-            # Check if this text pattern already exists
-            if normalized_text in existing_text_map:
-                # Add to existing entry
-                existing_idx = existing_text_map[normalized_text]
+    # Start after the highest existing lookup ID to avoid conflicts
+    next_lookup_id = find_next_lookup_id(lookup_table)
+    
+    added_to_existing = 0
+    new_entries_created = 0
+    changed_indices = set()
+    entry_id_sets = {}
+    
+    for result in normalized_comments:
+        comment_id = result['id']
+        
+        if result['error']:
+            logger.error(f"Error processing comment {comment_id}: {result['error']}")
+            continue
+        
+        if not result['normalized_text']:
+            logger.warning(f"Comment {comment_id} has empty text, skipping")
+            continue
+        
+        normalized_text = result['normalized_text']
+        text_key = dedup_key(normalized_text)
+        
+        length_key = _dedup_length_key(normalized_text)
+        if length_key not in loaded_lengths:
+            # Backfill the key on legacy entries so the next resume can skip them
+            for i in entries_by_length.pop(length_key, []):
+                key = dedup_key(normalize_text_for_dedup(lookup_table[i]['truncated_text']))
+                lookup_table[i]['dedup_key'] = key
+                existing_text_map[key] = i
+            loaded_lengths.add(length_key)
+        
+        # Check if this text pattern already exists
+        if text_key in existing_text_map:
+            # Add to existing entry
+            existing_idx = existing_text_map[text_key]
+            # Popular patterns collect thousands of IDs, so test membership against a set
+            # built the first time an entry is matched rather than scanning its list
+            entry_ids = entry_id_sets.get(existing_idx)
+            if entry_ids is None:
+                entry_ids = entry_id_sets[existing_idx] = set(lookup_table[existing_idx]['comment_ids'])
+            if comment_id not in entry_ids:
+                entry_ids.add(comment_id)
                 lookup_table[existing_idx]['comment_ids'].append(comment_id)
                 lookup_table[existing_idx]['comment_count'] += 1
+                changed_indices.add(existing_idx)
                 added_to_existing += 1
                 logger.debug(f"Added {comment_id} to existing pattern {lookup_table[existing_idx]['lookup_id']}")
-            else:
-                # Create new lookup entry
-                new_entry = {
-                    'lookup_id': f"lookup_{next_lookup_id:06d}",
-                    'truncated_text': truncated_text,
-                    'text_source': text_result['text_source'],
-                    'comment_text': text_result.get('comment_text', ''),
-                    'attachment_text': text_result.get('attachment_text', ''),
-                    'comment_ids': [comment_id],
-                    'comment_count': 1,
-                    'full_text_length': len(text_result.get('full_text', '')),
-                    'truncated_text_length': len(truncated_text),
-                    # Analysis fields (to be filled later)
-                    'stance': None,
-                    'key_quote': None,
-                    'rationale': None,
-                    'themes': None
-                }
-                
-                lookup_table.append(new_entry)
-                existing_text_map[normalized_text] = len(lookup_table) - 1
-                new_entries_created += 1
-                next_lookup_id += 1
-                logger.debug(f"Created new pattern {new_entry['lookup_id']} for {comment_id}")
-                
-        except Exception as e:
-            logger.error(f"Error processing comment {comment_data.get('id', 'unknown')}: {e}")
-            continue
-    
-    # Sort lookup table by comment count (most common first)
-    lookup_table.sort(key=lambda x: (-x['comment_count'], x['lookup_id']))
-    
-    # Save updated lookup table
-    with open(lookup_table_file, 'w') as f:
-        json.dump(lookup_table, f, indent=2)
-    
-    logger.info(f"✅ Lookup table updated:")
-    logger.info(f"   Added to existing patterns: {added_to_existing}")
-    logger.info(f"   New patterns created: {new_entries_created}")
-    logger.info(f"   Total lookup entries: {len(lookup_table)}")
-    
-    return lookup_table_file
+        else:
+            # Create new lookup entry
+            new_entry = {
+                'lookup_id': f"lookup_{next_lookup_id:06d}",
+                'truncated_text': result['truncated_text'],
+                'text_source': result['text_source'],
+                'comment_text': result['comment_text'],
+                'attachment_text': result['attachment_text'],
+                'comment_ids': [comment_id],
+                'comment_count': 1,
+                'full_text_length': result['full_text_length'],
+                'truncated_text_length': result['truncated_text_length'],
+                'dedup_key': text_key,
+                # Analysis fields (to be filled later)
+                'stance': None,
+                'key_quote': None,
+                'rationale': None,
+                'themes': None
+            }
+            
+            lookup_table.append(new_entry)
+            existing_text_map[text_key] = len(lookup_table) - 1
+            changed_indices.add(len(lookup_table) - 1)
+            new_entries_created += 1
+            next_lookup_id += 1
+            logger.debug(f"Created new pattern {new_entry['lookup_id']} for {comment_id}")
+    
+    return added_to_existing, new_entries_created, changed_indices
 
-def count_unanalyzed_entries(lookup_table_file: str) -> int:
-    """Count how many lookup entries need LLM analysis."""
-    if not os.path.exists(lookup_table_file):
-        return 0
-    
-    with open(lookup_table_file, 'r') as f:
-        lookup_table = json.load(f)
-    
-    unanalyzed = len([entry for entry in lookup_table if entry.get('stance') is None])
-    return unanalyzed
+def lookup_sort_key(entry: Dict[str, Any]) -> Tuple[int, str]:
+    """Lookup table order: most common patterns first, then by lookup ID."""
+    return (-entry['comment_count'], entry['lookup_id'])
+
+def resort_changed_entries(lookup_table: List[Dict[str, Any]], changed_indices: Set[int]) -> None:
+    """
+    Restore lookup table order in place after the entries at changed_indices were
+    modified or appended. Every other entry must already be in lookup_sort_key order
+    (create_lookup_table and each resume save it that way), so the changed entries are
+    pulled out and binary-inserted instead of re-sorting the whole table.
+    """
+    if len(changed_indices) > RESORT_INSORT_THRESHOLD:
+        lookup_table.sort(key=lookup_sort_key)
+        return
+    
+    changed_entries = [lookup_table[i] for i in changed_indices]
+    for i in sorted(changed_indices, reverse=True):
+        del lookup_table[i]
+    for entry in changed_entries:
+        bisect.insort(lookup_table, entry, key=lookup_sort_key)
+
+def validate_resume_output(raw_data_path: str, lookup_table_path: str, new_comment_count: int,
+                           raw_count: Optional[int] = None,
+                           lookup_table: Optional[List[Dict[str, Any]]] = None) -> None:
+    """
+    Check that resumed output files exist and are valid JSON, and log their stats.
+    A raw_count or lookup_table the caller already holds is used as-is instead of
+    parsing that file again.
+    """
+    try:
+        # Check that files exist and are valid JSON
+        if raw_count is None:
+            raw_count = len(load_json_mapped(raw_data_path))
+        elif not os.path.exists(raw_data_path):
+            raise FileNotFoundError(raw_data_path)
+        
+        if lookup_table is None:
+            lookup_table = load_json_mapped(lookup_table_path)
+        elif not os.path.exists(lookup_table_path):
+            raise FileNotFoundError(lookup_table_path)
+        lookup_count = len(lookup_table)
+        
+        # Count analyzed entries
+        analyzed_count = sum(1 for entry in lookup_table if entry.get('stance') is not None)
+        
+        logger.info(f"✅ Validation successful:")
+        logger.info(f"   Raw data: {raw_count:,} comments")
+        logger.info(f"   Lookup table: {lookup_count:,} entries")
+        logger.info(f"   Analyzed entries: {analyzed_count:,} ({analyzed_count/max(1,lookup_count)*100:.1f}%)")
+        logger.info(f"   New comments added: {new_comment_count:,}")
+        
+    except Exception as e:
+        logger.error(f"❌ Validation failed: {e}")
+
+
+def is_same_path(input_path: str, output_path: str) -> bool:
+    """True when output_path already exists and refers to the same file or directory as input_path."""
+    return os.path.exists(input_path) and os.path.exists(output_path) and os.path.samefile(input_path, output_path)
 
 def main():
     """Main resume pipeline function."""
@@ -572,13 +742,10 @@ def main():
         raise FileNotFoundError(f"Lookup table file not found: {input_lookup_table_path}")
     
     # Show initial stats
+    # raw_data.json is not parsed here; its comment count is logged when its IDs are read.
+    # The lookup table is parsed once and reused for validation and step 2
     logger.info(f"\n📊 Initial data check:")
-    with open(input_raw_data_path, 'r') as f:
-        existing_raw_data = json.load(f)
-    logger.info(f"   Existing raw_data.json: {len(existing_raw_data):,} comments")
-    
-    with open(input_lookup_table_path, 'r') as f:
-        existing_lookup = json.load(f)
+    existing_lookup = load_json_mapped(input_lookup_table_path)
     logger.info(f"   Existing lookup table: {len(existing_lookup):,} entries")
     
     # Create output directory
@@ -589,181 +756,125 @@ def main():
     
     try:
         # Step 1: Validate truncation consistency
-        validated_truncation = validate_truncation_consistency(input_lookup_table_path, args.truncate)
-        
-        # Step 2: Find new comment IDs (compare CSV with input raw data)
-        all_new_comment_ids = find_new_comment_ids(args.csv, input_raw_data_path, limit=None)
-        
-        # Apply limit to NEW comments only (not total CSV)
-        if args.limit is not None and args.limit > 0 and len(all_new_comment_ids) > args.limit:
-            logger.info(f"📊 Found {len(all_new_comment_ids)} new comments, limiting to first {args.limit}")
-            new_comment_ids = set(list(all_new_comment_ids)[:args.limit])
-        else:
-            new_comment_ids = all_new_comment_ids
-            if args.limit is not None and args.limit > 0:
-                logger.info(f"📊 Found {len(all_new_comment_ids)} new comments (no limiting needed, less than {args.limit})")
-        
-        # Initialize counters for summary
-        added_to_existing = 0
-        new_entries_created = 0
-        unanalyzed_count = 0
-        
-        # Copy existing files to output directory first
-        logger.info(f"\n=== Preparing output directory ===")
-        
-        if os.path.exists(input_raw_data_path):
-            shutil.copy2(input_raw_data_path, output_raw_data_path)
-            logger.info(f"✅ Copied raw_data.json to output directory")
-        
-        if os.path.exists(input_lookup_table_path):
-            shutil.copy2(input_lookup_table_path, output_lookup_table_path)
-            logger.info(f"✅ Copied lookup table to output directory")
-        
-        # Copy attachments directory if it exists
-        input_dir = os.path.dirname(input_raw_data_path)
-        input_attachments_dir = os.path.join(input_dir, "attachments")
-        output_attachments_dir = os.path.join(args.output_dir, "attachments")
-        
-        if os.path.exists(input_attachments_dir):
-            logger.info(f"📎 Copying existing attachments directory...")
-            shutil.copytree(input_attachments_dir, output_attachments_dir, dirs_exist_ok=True)
-            # Count files copied
-            file_count = sum(len(files) for _, _, files in os.walk(output_attachments_dir))
-            logger.info(f"✅ Copied {file_count} attachment files to output directory")
-        else:
-            logger.info(f"📎 No existing attachments directory found")
-        
-        # Fetch and append new comments with attachments
-        if new_comment_ids:
-            logger.info(f"\n=== STEP 1: Fetching {len(new_comment_ids):,} New Comments ===")
-            fetch_and_append_new_comments(new_comment_ids, args.csv, output_raw_data_path, args.output_dir)
-        else:
-            logger.info(f"\n=== STEP 1: No New Comments to Fetch ===")
-            logger.info(f"   All comments from CSV already exist in raw_data.json")
+        validated_truncation = validate_truncation_consistency(input_lookup_table_path, args.truncate, existing_lookup)
+        
+        # Step 2: Find new comment IDs (compare CSV with input raw data), saving their rows for the fetch
+        # The filtered CSV lives in a scratch directory that is removed with everything
+        # in it once the fetch is done, whether or not it succeeds
+        with tempfile.TemporaryDirectory(dir=args.output_dir) as scratch_dir:
+            new_comments_csv = os.path.join(scratch_dir, 'new_comments_temp.csv')
+            new_comment_ids, raw_count = find_new_comment_ids(
+                args.csv, input_raw_data_path, new_comments_csv, limit=args.limit)
+            
+            # Initialize counters for summary
+            added_to_existing = 0
+            new_entries_created = 0
+            unanalyzed_count = 0
+            
+            # Copy existing files to output directory first
+            logger.info(f"\n=== Preparing output directory ===")
+            
+            # Clones rather than hardlinks: raw_data.json is appended to in place and the
+            # lookup table is rewritten, and neither change may reach the input files.
+            # When resuming into the inputs' own directory there is nothing to copy, and
+            # opening a file onto itself for writing would truncate it
+            if is_same_path(input_raw_data_path, output_raw_data_path):
+                logger.info(f"✅ raw_data.json is already in the output directory")
+            elif os.path.exists(input_raw_data_path):
+                clone_file(input_raw_data_path, output_raw_data_path)
+                logger.info(f"✅ Copied raw_data.json to output directory")
+            
+            if is_same_path(input_lookup_table_path, output_lookup_table_path):
+                logger.info(f"✅ Lookup table is already in the output directory")
+            elif os.path.exists(input_lookup_table_path):
+                clone_file(input_lookup_table_path, output_lookup_table_path)
+                logger.info(f"✅ Copied lookup table to output directory")
+            
+            # Copy attachments directory if it exists
+            input_dir = os.path.dirname(input_raw_data_path)
+            input_attachments_dir = os.path.join(input_dir, "attachments")
+            output_attachments_dir = os.path.join(args.output_dir, "attachments")
+            
+            if is_same_path(input_attachments_dir, output_attachments_dir):
+                logger.info(f"📎 Attachments directory is already in the output directory")
+            elif os.path.exists(input_attachments_dir):
+                logger.info(f"📎 Copying existing attachments directory...")
+                # Count files as they are copied instead of walking the tree again afterwards
+                copied_files = []
+                
+                def copy_and_count(src, dst):
+                    copied_files.append(src)
+                    return clone_file(src, dst)
+                
+                shutil.copytree(input_attachments_dir, output_attachments_dir, copy_function=copy_and_count, dirs_exist_ok=True)
+                logger.info(f"✅ Copied {len(copied_files)} attachment files to output directory")
+            else:
+                logger.info(f"📎 No existing attachments directory found")
+            
+            # Fetch and append new comments with attachments
+            if new_comment_ids:
+                logger.info(f"\n=== STEP 1: Fetching {len(new_comment_ids):,} New Comments ===")
+                new_comments = fetch_and_append_new_comments(new_comment_ids, new_comments_csv, output_raw_data_path, args.output_dir)
+                raw_count += len(new_comments)
+            else:
+                logger.info(f"\n=== STEP 1: No New Comments to Fetch ===")
+                logger.info(f"   All comments from CSV already exist in raw_data.json")
         
         # Update lookup table with new comments
         logger.info(f"\n=== STEP 2: Updating Lookup Table ===")
         
-        # Load the existing lookup table that was copied
-        with open(output_lookup_table_path, 'r') as f:
-            lookup_table = json.load(f)
-        logger.info(f"   Starting with {len(lookup_table)} existing entries")
-        
-        # Only process new comments if any were fetched
+        # Only touch the lookup table if new comments were fetched; otherwise the
+        # copied table is already current
+        # The copy in the output directory matches the input table parsed at start-up
+        lookup_table = existing_lookup
+        lookup_write = None
         if new_comment_ids:
+            logger.info(f"   Starting with {len(lookup_table)} existing entries")
             
-            # Load the complete raw data to get the new comments
-            with open(output_raw_data_path, 'r') as f:
-                complete_raw_data = json.load(f)
-            
-            # Get just the new comments
-            new_comments = [c for c in complete_raw_data if c.get('id') in new_comment_ids]
+            # The new comments come straight from step 1; raw_data.json is not read back
             logger.info(f"   Processing {len(new_comments)} new comments")
             
-            # Create mapping of normalized text to existing lookup entries
-            existing_text_map = {}
-            for i, entry in enumerate(lookup_table):
-                normalized = normalize_text_for_dedup(entry['truncated_text'])
-                existing_text_map[normalized] = i
+            normalized_comments = normalize_new_comments(new_comments, validated_truncation)
+            added_to_existing, new_entries_created, changed_indices = add_comments_to_lookup_table(
+                lookup_table, normalized_comments)
             
-            # Process each new comment
-            added_to_existing = 0
-            new_entries_created = 0
+            logger.info(f"   Added to existing entries: {added_to_existing}")
+            logger.info(f"   New entries created: {new_entries_created}")
             
-            # Find the highest existing lookup ID
-            max_id = 0
-            for entry in lookup_table:
-                lookup_id = entry.get('lookup_id', 'lookup_000000')
-                try:
-                    id_num = int(lookup_id.split('_')[1])
-                    max_id = max(max_id, id_num)
-                except (IndexError, ValueError):
-                    continue
-            next_lookup_id = max_id + 1
+            # Sort lookup table by comment count (most common first)
+            resort_changed_entries(lookup_table, changed_indices)
             
-            for comment_data in new_comments:
-                try:
-                    comment_id = comment_data['id']
-                    
-                    # Extract and normalize text
-                    text_result = extract_and_combine_text(comment_data, validated_truncation)
-                    truncated_text = text_result['truncated_text']
-                    
-                    if not truncated_text.strip():
-                        logger.warning(f"Comment {comment_id} has empty text, skipping")
-                        continue
-                    
-                    normalized_text = normalize_text_for_dedup(truncated_text)
-                    
-                    # Check if this text pattern already exists
-                    if normalized_text in existing_text_map:
-                        # Add to existing entry
-                        existing_idx = existing_text_map[normalized_text]
-                        if comment_id not in lookup_table[existing_idx]['comment_ids']:
-                            lookup_table[existing_idx]['comment_ids'].append(comment_id)
-                            lookup_table[existing_idx]['comment_count'] += 1
-                            added_to_existing += 1
-                    else:
-                        # Create new lookup entry
-                        new_entry = {
-                            'lookup_id': f"lookup_{next_lookup_id:06d}",
-                            'truncated_text': truncated_text,
-                            'text_source': text_result['text_source'],
-                            'comment_text': text_result.get('comment_text', ''),
-                            'attachment_text': text_result.get('attachment_text', ''),
-                            'comment_ids': [comment_id],
-                            'comment_count': 1,
-                            'full_text_length': len(text_result.get('full_text', '')),
-                            'truncated_text_length': len(truncated_text),
-                            'stance': None,
-                            'key_quote': None,
-                            'rationale': None,
-                            'themes': None
-                        }
-                        
-                        lookup_table.append(new_entry)
-                        existing_text_map[normalized_text] = len(lookup_table) - 1
-                        new_entries_created += 1
-                        next_lookup_id += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing comment {comment_data.get('id', 'unknown')}: {e}")
-                    continue
+            # Save the updated lookup table on a writer thread; it overlaps with the
+            # report below and analyzer setup, and is waited on before anything else
+            # reads or rewrites the file
+            lookup_writer = ThreadPoolExecutor(max_workers=1)
+            lookup_write = lookup_writer.submit(dump_json_compact, lookup_table, output_lookup_table_path)
+            lookup_writer.shutdown(wait=False)
             
-            logger.info(f"   Added to existing entries: {added_to_existing}")
-            logger.info(f"   New entries created: {new_entries_created}")
-        
-        # Sort lookup table by comment count (most common first)
-        lookup_table.sort(key=lambda x: (-x['comment_count'], x['lookup_id']))
-        
-        # Save the updated lookup table
-        with open(output_lookup_table_path, 'w') as f:
-            json.dump(lookup_table, f, indent=2)
-        
-        logger.info(f"✅ Lookup table saved with {len(lookup_table)} entries")
-        
-        # Report on new entries
-        if new_comment_ids:
-            new_entries = sum(1 for entry in lookup_table 
-                            if any(cid in new_comment_ids for cid in entry.get('comment_ids', [])))
-            logger.info(f"   Including {new_entries} entries with new comments")
+            logger.info(f"✅ Saving lookup table with {len(lookup_table)} entries")
+            
+            # Report on new entries; exactly the entries that were changed
+            logger.info(f"   Including {len(changed_indices)} entries with new comments")
+        else:
+            logger.info(f"   No new comments; lookup table unchanged")
         
         # Step 3: Run LLM analysis on unanalyzed entries
         if not args.skip_analysis:
-            unanalyzed_count = count_unanalyzed_entries(output_lookup_table_path)
+            # Count on the table already in memory rather than parsing the file again
+            unanalyzed_count = len(lookup_table) - count_analyzed_entries(lookup_table)
             if unanalyzed_count > 0:
                 logger.info(f"\n=== STEP 3: LLM Analysis ({unanalyzed_count} entries) ===")
                 
                 # Initialize analyzer
                 analyzer = CommentAnalyzer(model=args.model)
                 
-                # Load lookup table
-                with open(output_lookup_table_path, 'r') as f:
-                    lookup_table_to_analyze = json.load(f)
+                # Analysis fills entries in place, so the pending save must finish first
+                if lookup_write is not None:
+                    lookup_write.result()
                 
                 # Analyze unanalyzed entries
                 analyzed_lookup_table = analyze_lookup_table_batch(
-                    lookup_table=lookup_table_to_analyze,
+                    lookup_table=lookup_table,
                     analyzer=analyzer,
                     batch_size=config.llm.batch_size,
                     use_parallel=True,
@@ -771,8 +882,8 @@ def main():
                 )
                 
                 # Save analyzed lookup table back to the original file
-                with open(output_lookup_table_path, 'w') as f:
-                    json.dump(analyzed_lookup_table, f, indent=2)
+                lookup_table = analyzed_lookup_table
+                dump_json_compact(lookup_table, output_lookup_table_path)
                 
                 logger.info(f"✅ Analysis complete, saved to {output_lookup_table_path}")
             else:
@@ -780,15 +891,17 @@ def main():
         else:
             logger.info(f"\n=== STEP 3: Skipping LLM Analysis ===")
         
+        # Later steps read the lookup table file
+        if lookup_write is not None:
+            lookup_write.result()
+        
         # Step 4: Run clustering
         n_entries = 0  # Initialize for use in final summary
         if not args.skip_clustering:
             logger.info(f"\n=== STEP 4: Semantic Clustering ===")
             
-            # Check how many entries we have for clustering
-            with open(output_lookup_table_path, 'r') as f:
-                lookup_table = json.load(f)
-            
+            # Check how many entries we have for clustering; the table in memory is
+            # what was just saved, so the file is not parsed again
             n_entries = len(lookup_table)
             # Ensure we don't request more clusters than entries
             if n_entries == 0:
@@ -798,78 +911,61 @@ def main():
             else:
                 logger.info(f"Running hierarchical clustering on {n_entries} entries")
                 
-                # Run clustering
-                
-                # Get absolute path to the hierarchical_clustering script
-                script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                clustering_script = os.path.join(script_dir, 'backend', 'analysis', 'hierarchical_clustering.py')
-                
-                clustering_cmd = [
-                    sys.executable, 
-                    clustering_script,
-                    '--input', output_lookup_table_path,
-                    '--output_dir', args.output_dir
-                ]
-                
-                result = subprocess.run(clustering_cmd, capture_output=True, text=True)
-                
-                if result.returncode == 0:
+                # Run clustering in-process; imported here so runs with --skip_clustering
+                # never pay for loading the embedding/ML stack
+                try:
+                    from backend.analysis.hierarchical_clustering import run_hierarchical_clustering
+                    run_hierarchical_clustering(output_lookup_table_path, args.output_dir)
                     logger.info("✅ Clustering complete")
-                    logger.info(result.stdout)
-                else:
-                    logger.error("❌ Clustering failed")
-                    logger.error(result.stderr)
+                except Exception as e:
+                    logger.error(f"❌ Clustering failed: {e}")
         else:
             logger.info(f"\n=== STEP 4: Skipping Clustering ===")
         
-        # Step 5: Quote verification (always run if analysis was performed)
-        if not args.skip_analysis:
-            logger.info(f"\n=== STEP 5: Quote Verification ===")
-            
-            # Run quote verification
+        # Steps 5 and 6 only read the finished outputs and write disjoint files,
+        # so quote verification runs on a worker thread while validation proceeds
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            verification_future = None
             
-            # Use the lookup table path
-            verification_output = output_lookup_table_path.replace('.json', '_quote_verification.json')
-            text_report_output = output_lookup_table_path.replace('.json', '_quote_verification.txt')
-            
-            logger.info(f"Verifying quotes in {output_lookup_table_path}...")
-            verification_results = verify_lookup_quotes(output_lookup_table_path, verification_output, text_report_output)
-            
-            if verification_results:
-                logger.info(f"✅ Quote verification complete")
-                logger.info(f"   Verification rate: {verification_results.get('verification_rate', 0)}%")
-                logger.info(f"   Exact matches: {verification_results.get('exact_match_rate', 0)}%")
-                logger.info(f"   Quotes not found: {verification_results.get('quotes_not_found', 0)} ({round(verification_results.get('quotes_not_found', 0) / max(1, verification_results.get('entries_with_quotes', 1)) * 100, 1)}%)")
-                logger.info(f"   Results saved to: {verification_output}")
-                logger.info(f"   Text report: {verification_output.replace('.json', '.txt')}")
-            else:
-                logger.error("❌ Quote verification failed")
-        
-        # Step 6: Validate output (simplified for resume pipeline)
-        logger.info(f"\n=== STEP 6: Validating Pipeline Output ===")
-        
-        # Simple validation for resume pipeline
-        try:
-            # Check that files exist and are valid JSON
-            with open(output_raw_data_path, 'r') as f:
-                raw_data = json.load(f)
-            raw_count = len(raw_data)
-            
-            with open(output_lookup_table_path, 'r') as f:
-                lookup_table = json.load(f)
-            lookup_count = len(lookup_table)
+            # Step 5: Quote verification (always run if analysis was performed)
+            if not args.skip_analysis:
+                logger.info(f"\n=== STEP 5: Quote Verification ===")
+                
+                # Use the lookup table path
+                verification_output = sibling_path(output_lookup_table_path, '_quote_verification')
+                text_report_output = sibling_path(output_lookup_table_path, '_quote_verification', '.txt')
+                
+                logger.info(f"Verifying quotes in {output_lookup_table_path}...")
+                verification_future = executor.submit(
+                    verify_lookup_quotes, output_lookup_table_path, verification_output, text_report_output
+                )
             
-            # Count analyzed entries
-            analyzed_count = sum(1 for entry in lookup_table if entry.get('stance') is not None)
+            # Step 6: Validate output (simplified for resume pipeline)
+            # The counts come from the objects already in memory; neither output is parsed again
+            logger.info(f"\n=== STEP 6: Validating Pipeline Output ===")
+            validation_future = executor.submit(
+                validate_resume_output, output_raw_data_path, output_lookup_table_path, len(new_comment_ids),
+                raw_count=raw_count, lookup_table=lookup_table
+            )
             
-            logger.info(f"✅ Validation successful:")
-            logger.info(f"   Raw data: {raw_count:,} comments")
-            logger.info(f"   Lookup table: {lookup_count:,} entries")
-            logger.info(f"   Analyzed entries: {analyzed_count:,} ({analyzed_count/max(1,lookup_count)*100:.1f}%)")
-            logger.info(f"   New comments added: {len(new_comment_ids):,}")
+            if verification_future is not None:
+                try:
+                    verification_results = verification_future.result()
+                except Exception as e:
+                    logger.error(f"❌ Quote verification failed: {e}")
+                    verification_results = None
+                
+                if verification_results:
+                    logger.info(f"✅ Quote verification complete")
+                    logger.info(f"   Verification rate: {verification_results.get('verification_rate', 0)}%")
+                    logger.info(f"   Exact matches: {verification_results.get('exact_match_rate', 0)}%")
+                    logger.info(f"   Quotes not found: {verification_results.get('quotes_not_found', 0)} ({round(verification_results.get('quotes_not_found', 0) / max(1, verification_results.get('entries_with_quotes', 1)) * 100, 1)}%)")
+                    logger.info(f"   Results saved to: {verification_output}")
+                    logger.info(f"   Text report: {text_report_output}")
+                else:
+                    logger.error("❌ Quote verification failed")
             
-        except Exception as e:
-            logger.error(f"❌ Validation failed: {e}")
+            validation_future.result()
         
         # Final summary with better visibility
         logger.info(f"\n{'='*60}")
@@ -890,8 +986,8 @@ def main():
         logger.info(f"   - {os.path.basename(output_raw_data_path)} (raw comment data)")
         logger.info(f"   - {os.path.basename(output_lookup_table_path)} (deduplicated patterns with analysis)")
         if not args.skip_analysis:
-            logger.info(f"   - {os.path.basename(output_lookup_table_path.replace('.json', '_quote_verification.json'))}")
-            logger.info(f"   - {os.path.basename(output_lookup_table_path.replace('.json', '_quote_verification.txt'))}")
+            logger.info(f"   - {os.path.basename(sibling_path(output_lookup_table_path, '_quote_verification'))}")
+            logger.info(f"   - {os.path.basename(sibling_path(output_lookup_table_path, '_quote_verification', '.txt'))}")
         if not args.skip_clustering and n_entries >= 2:
             logger.info(f"   - cluster_report.txt")
             logger.info(f"   - clusters_visualization.png")
@@ -3,7 +3,7 @@ Utility modules for the pipeline.
 """
 
 from .comment_analyzer import CommentAnalyzer
-from .common import create_directory, get_latest_results_dir
+from .common import create_directory, get_latest_results_dir, sibling_path, load_json_mapped, dump_json_compact, append_json_array, clone_file, file_sha256
 from .file_operations import FileManager
 from .logging_config import PipelineLogger, setup_pipeline_logging
 from .exceptions import (
@@ -25,6 +25,12 @@ __all__ = [
     "setup_pipeline_logging",
     "create_directory",
     "get_latest_results_dir",
+    "sibling_path",
+    "load_json_mapped",
+    "dump_json_compact",
+    "append_json_array",
+    "clone_file",
+    "file_sha256",
     
     # Exceptions
     "PipelineError",
@@ -180,16 +180,9 @@ Analyze objectively and avoid inserting personal opinions or biases."""
             try:
                 result = self.analyze_with_timeout(comment_text, comment_id)
                 
-                # Validate the result has required fields
-                if not isinstance(result, dict):
-                    raise ValueError("Result is not a dictionary")
-                
-                required_fields = ['stance', 'themes', 'key_quote', 'rationale']
-                for field in required_fields:
-                    if field not in result:
-                        raise ValueError(f"Missing required field: {field}")
-                
-                return result
+                # Validate against the same model the response was requested in; a missing
+                # field or off-list stance/theme raises ValidationError and is retried
+                return CommentAnalysisResult.model_validate(result).model_dump(mode='json')
                 
             except Exception as e:
                 last_error = e
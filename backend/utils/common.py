@@ -10,8 +10,30 @@ import os
 import glob
 import re
 import html
+import hashlib
+import json
+import mmap
+import shutil
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+# Linux FICLONE ioctl: make dst share src's data blocks copy-on-write (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Items per orjson call when dump_json_compact streams a list
+JSON_WRITE_CHUNK = 1000
+
+HTML_TAG_PATTERN = re.compile(r'<[^>]*>')
+
 def create_directory(directory_path):
     """Create a directory if it doesn't exist."""
     if not os.path.exists(directory_path):
@@ -41,12 +63,139 @@ def create_timestamped_dir(base_dir="results"):
     print(f"Created results directory: {result_dir}")
     return result_dir
 
+def sibling_path(base_path, suffix, ext=None):
+    """
+    Build a path next to base_path with suffix added to its stem.
+    
+    e.g. sibling_path('out/lookup_table.json', '_quote_verification', '.txt')
+    -> 'out/lookup_table_quote_verification.txt'. The extension is kept when
+    ext is None. Unlike str.replace('.json', ...), only the final extension is touched.
+    """
+    root, base_ext = os.path.splitext(str(base_path))
+    return f"{root}{suffix}{base_ext if ext is None else ext}"
+
+def load_json_mapped(file_path):
+    """
+    Parse a JSON file through a read-only memory map.
+    
+    The kernel pages the file in on demand (and reuses the page cache on
+    re-runs) instead of copying it into a Python bytes object first. Parsing
+    uses orjson when it is installed.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap cannot map an empty file; let the parser raise its usual error
+            return json.loads(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is not None:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json.loads(mm[:])
+
+def dump_json_compact(data, file_path):
+    """
+    Write data to file_path as compact JSON, using orjson when it is installed.
+    
+    Meant for pipeline-internal files (raw_data.json, lookup_table.json) that
+    are only ever read back by code. Lists are encoded JSON_WRITE_CHUNK items at
+    a time, so the serialized form of the whole table is never held in memory.
+    """
+    if orjson is not None:
+        with open(file_path, 'wb') as f:
+            if not isinstance(data, list):
+                f.write(orjson.dumps(data))
+                return
+            f.write(b'[')
+            for start in range(0, len(data), JSON_WRITE_CHUNK):
+                if start:
+                    f.write(b',')
+                f.write(orjson.dumps(data[start:start + JSON_WRITE_CHUNK])[1:-1])
+            f.write(b']')
+    else:
+        # json.dump already writes through iterencode chunk by chunk
+        with open(file_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+def append_json_array(items, file_path):
+    """
+    Append items to the JSON array stored in file_path without rewriting it.
+    
+    Only the closing bracket is replaced, so the cost is proportional to the
+    new items rather than the existing file. A missing or empty file is
+    created as a new array.
+    """
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        dump_json_compact(list(items), file_path)
+        return
+    
+    with open(file_path, 'r+b') as f:
+        # Walk back over trailing whitespace to the closing bracket
+        end = f.seek(0, os.SEEK_END)
+        closing = _previous_non_space(f, end)
+        if closing is None or _byte_at(f, closing) != b']':
+            raise ValueError(f"{file_path} does not contain a JSON array")
+        opening = _previous_non_space(f, closing)
+        if opening is None:
+            # Nothing but the closing bracket: there is no opening one to append after
+            raise ValueError(f"{file_path} does not contain a JSON array")
+        separator = b'' if _byte_at(f, opening) == b'[' else b','
+        
+        f.seek(closing)
+        f.truncate()
+        for item in items:
+            if orjson is not None:
+                f.write(separator + orjson.dumps(item))
+            else:
+                f.write(separator + json.dumps(item, separators=(',', ':')).encode('utf-8'))
+            separator = b','
+        f.write(b']')
+
+def _byte_at(f, position):
+    f.seek(position)
+    return f.read(1)
+
+def _previous_non_space(f, position):
+    """Return the offset of the last non-whitespace byte before position, or None."""
+    while position > 0:
+        position -= 1
+        if not _byte_at(f, position).isspace():
+            return position
+    return None
+
+def clone_file(src, dst):
+    """
+    Copy src to dst as a copy-on-write clone where the filesystem supports it,
+    falling back to shutil.copy2.
+    
+    A clone is near-instant and shares disk blocks, but unlike a hardlink later
+    writes to either file (including in-place appends) never show up in the other.
+    Matches shutil.copy2's signature so it can be a copytree copy_function.
+    """
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            pass  # Filesystem or platform cannot clone; do a regular copy
+    return shutil.copy2(src, dst)
+
+def file_sha256(file_path, chunk_size=1 << 20):
+    """Return the hex SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def strip_html_tags(text):
     """Remove HTML tags and decode HTML entities from text."""
     if not text:
         return text
-    # First remove HTML tags
-    text = re.sub(r'<[^>]*>', '', text)
+    # First remove HTML tags; most comments are plain text and skip the regex
+    if '<' in text:
+        text = HTML_TAG_PATTERN.sub('', text)
     # Then decode HTML entities like &rsquo; and &ldquo;
     text = html.unescape(text)
     return text 
\ No newline at end of file
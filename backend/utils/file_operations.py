@@ -5,12 +5,20 @@ This module provides standardized file operations with proper error handling
 and logging.
 """
 
+import fnmatch
 import json
 import logging
+import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder/parser
+    orjson = None
+
+from .common import clone_file
 from .exceptions import FileOperationError
 from .logging_config import PipelineLogger
 
@@ -37,7 +45,7 @@ class FileManager:
         try:
             dir_path = Path(path)
             dir_path.mkdir(parents=True, exist_ok=True)
-            logger.debug(f"Directory ensured: {dir_path}")
+            logger.debug("Directory ensured: %s", dir_path)
             return dir_path
         except Exception as e:
             raise FileOperationError(
@@ -74,9 +82,13 @@ class FileManager:
             return None
         
         try:
-            with path.open('r', encoding='utf-8') as f:
-                data = json.load(f)
-            logger.debug(f"JSON loaded successfully: {file_path}")
+            if orjson is not None:
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError, so it is handled below
+                data = orjson.loads(path.read_bytes())
+            else:
+                with path.open('r', encoding='utf-8') as f:
+                    data = json.load(f)
+            logger.debug("JSON loaded successfully: %s", file_path)
             return data
         except json.JSONDecodeError as e:
             raise FileOperationError(
@@ -103,6 +115,13 @@ class FileManager:
         """
         Save data to a JSON file.
         
+        The data is written to a temporary file that then replaces file_path,
+        so the original stays intact if the write fails part-way.
+        
+        With orjson installed and indent=2 the output is not byte-identical to
+        json.dump: floats may be spelled differently (1e-05 as 0.00001), NaN and
+        Infinity are written as null, and integers wider than 64 bits fail.
+        
         Args:
             data: Data to save
             file_path: Path to save file
@@ -118,7 +137,9 @@ class FileManager:
         if backup and path.exists():
             backup_path = path.with_suffix(f'.{datetime.now().strftime("%Y%m%d_%H%M%S")}.bak')
             try:
-                path.rename(backup_path)
+                # Copy (a copy-on-write clone where supported) rather than rename, so
+                # the original stays in place until the new file replaces it
+                clone_file(path, backup_path)
                 logger.info(f"Created backup: {backup_path}")
             except Exception as e:
                 logger.warning(f"Failed to create backup: {e}")
@@ -126,11 +147,18 @@ class FileManager:
         # Ensure parent directory exists
         FileManager.ensure_directory(path.parent)
         
+        temp_path = path.with_name(f"{path.name}.tmp")
         try:
-            with path.open('w', encoding='utf-8') as f:
-                json.dump(data, f, indent=indent, ensure_ascii=False)
-            logger.debug(f"JSON saved successfully: {file_path}")
+            if orjson is not None and indent == 2:
+                # orjson only pretty-prints with a 2-space indent
+                temp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with temp_path.open('w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=indent, ensure_ascii=False)
+            os.replace(temp_path, path)
+            logger.debug("JSON saved successfully: %s", file_path)
         except Exception as e:
+            temp_path.unlink(missing_ok=True)
             raise FileOperationError(
                 f"Failed to save file: {file_path}",
                 file_path=str(file_path),
@@ -155,14 +183,15 @@ class FileManager:
             return None
         
         try:
-            dirs = list(base_path.glob(pattern))
+            # One scandir pass; each DirEntry caches its stat result for the sort key
+            with os.scandir(base_path) as entries:
+                dirs = [entry for entry in entries if fnmatch.fnmatch(entry.name, pattern) and entry.is_dir()]
             if not dirs:
                 return None
             
-            # Sort by creation time (newest first)
-            dirs.sort(key=lambda p: p.stat().st_ctime, reverse=True)
-            latest = dirs[0]
-            logger.debug(f"Latest timestamped directory: {latest}")
+            # Newest first by creation time
+            latest = Path(max(dirs, key=lambda entry: entry.stat().st_ctime).path)
+            logger.debug("Latest timestamped directory: %s", latest)
             return latest
         except Exception as e:
             logger.warning(f"Error finding latest directory: {e}")
@@ -6,51 +6,99 @@ Fix schema compliance issues in lookup_table.json by populating missing fields
 import json
 import os
 import logging
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Any, Optional, Set
+
+from tqdm import tqdm
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to parsing the whole file
+    ijson = None
+
+try:
+    from backend.utils.common import load_json_mapped, dump_json_compact
+except ImportError:
+    # Standalone script run from this directory
+    from common import load_json_mapped, dump_json_compact
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def load_raw_data_mapping(raw_data_path: str) -> Dict[str, Dict]:
-    """Load raw data and create a mapping by comment ID."""
+# Threads reading .extracted.txt files; the reads block on I/O, not the GIL
+ATTACHMENT_READ_WORKERS = 16
+
+# Characters read from an extracted file to spot a '[...]' error marker before reading the rest
+ATTACHMENT_PEEK_CHARS = 64
+
+# Fields every lookup entry must carry; a set so an entry is checked with one difference
+REQUIRED_FIELDS = frozenset(['comment_text', 'attachment_text', 'full_text_length', 'truncated_text_length'])
+
+def load_raw_data_mapping(raw_data_path: str, comment_ids: Optional[Set[str]] = None) -> Dict[str, Dict]:
+    """
+    Load raw data and create a mapping by comment ID.
+    With comment_ids, only those comments are kept; with ijson the file is
+    streamed, so the full comment list is never held in memory.
+    """
     logger.info(f"Loading raw data from {raw_data_path}")
     
-    with open(raw_data_path, 'r') as f:
-        raw_data = json.load(f)
-    
-    # Create mapping: comment_id -> comment_data
-    raw_data_map = {}
-    for comment in raw_data:
-        comment_id = comment['id']
-        raw_data_map[comment_id] = comment
+    with open(raw_data_path, 'rb') as f:
+        comments = ijson.items(f, 'item', use_float=True) if ijson is not None else json.load(f)
+        
+        # Create mapping: comment_id -> comment_data
+        raw_data_map = {}
+        for comment in comments:
+            comment_id = comment['id']
+            if comment_ids is None or comment_id in comment_ids:
+                raw_data_map[comment_id] = comment
     
     logger.info(f"Loaded {len(raw_data_map):,} raw data entries")
     return raw_data_map
 
-def extract_text_from_comment(comment_data: Dict, attachments_dir: str) -> Dict[str, str]:
+def build_attachment_index(attachments_dir: str, comment_ids: Optional[Set[str]] = None) -> Dict[str, List[str]]:
+    """
+    Map each comment ID to the sorted paths of its .extracted.txt files, in one
+    scandir pass over attachments_dir. With comment_ids, other comments are skipped.
+    """
+    attachment_index = {}
+    if not os.path.isdir(attachments_dir):
+        return attachment_index
+    
+    with os.scandir(attachments_dir) as comment_dirs:
+        for comment_dir in comment_dirs:
+            if (comment_ids is not None and comment_dir.name not in comment_ids) or not comment_dir.is_dir():
+                continue
+            with os.scandir(comment_dir.path) as files:
+                extracted_paths = [f.path for f in files if f.name.endswith('.extracted.txt')]
+            if extracted_paths:
+                # Sorting full paths within one directory orders them by filename
+                attachment_index[comment_dir.name] = sorted(extracted_paths)
+    
+    return attachment_index
+
+def extract_text_from_comment(comment_data: Dict, attachment_index: Dict[str, List[str]]) -> Dict[str, str]:
     """Extract comment text and attachment text for a comment."""
     comment_id = comment_data['id']
     
     # Get comment text
     comment_text = comment_data.get('attributes', {}).get('comment', '')
     
-    # Get attachment text
+    # Get attachment text from this comment's .extracted.txt files
     attachment_texts = []
-    comment_attachments_dir = os.path.join(attachments_dir, comment_id)
-    
-    if os.path.exists(comment_attachments_dir):
-        # Find all .extracted.txt files
-        for filename in sorted(os.listdir(comment_attachments_dir)):
-            if filename.endswith('.extracted.txt'):
-                extracted_path = os.path.join(comment_attachments_dir, filename)
-                try:
-                    with open(extracted_path, 'r', encoding='utf-8') as f:
-                        attachment_text = f.read().strip()
-                        if attachment_text and not attachment_text.startswith('['):  # Skip error messages
-                            attachment_texts.append(attachment_text)
-                except Exception as e:
-                    logger.warning(f"Could not read attachment {extracted_path}: {e}")
+    for extracted_path in attachment_index.get(comment_id, []):
+        try:
+            with open(extracted_path, 'r', encoding='utf-8') as f:
+                # Error messages start with '['; reject them without reading the whole file
+                head = f.read(ATTACHMENT_PEEK_CHARS)
+                if head.lstrip().startswith('['):
+                    continue
+                attachment_text = (head + f.read()).strip()
+                if attachment_text and not attachment_text.startswith('['):  # Skip error messages
+                    attachment_texts.append(attachment_text)
+        except Exception as e:
+            logger.warning(f"Could not read attachment {extracted_path}: {e}")
     
     attachment_text = '\n\n--- NEXT ATTACHMENT ---\n\n'.join(attachment_texts)
     
@@ -59,12 +107,24 @@ def extract_text_from_comment(comment_data: Dict, attachments_dir: str) -> Dict[
         'attachment_text': attachment_text
     }
 
-def fix_lookup_entry(entry: Dict, raw_data_map: Dict[str, Dict], attachments_dir: str) -> Dict:
+def load_comment_texts(comment_ids: Set[str], raw_data_map: Dict[str, Dict],
+                       attachment_index: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
+    """
+    Extract the text of each comment in comment_ids that is in raw_data_map,
+    reading attachments on a thread pool. Each comment is read once, however
+    many lookup entries refer to it.
+    """
+    comments = [raw_data_map[comment_id] for comment_id in comment_ids if comment_id in raw_data_map]
+    
+    with ThreadPoolExecutor(max_workers=ATTACHMENT_READ_WORKERS) as executor:
+        text_data = executor.map(partial(extract_text_from_comment, attachment_index=attachment_index), comments)
+        return {comment['id']: texts for comment, texts in zip(comments, text_data)}
+
+def fix_lookup_entry(entry: Dict, comment_texts: Dict[str, Dict[str, str]]) -> Dict:
     """Fix a single lookup entry by populating missing fields."""
     
     # If all required fields are present, return as-is
-    required_fields = ['comment_text', 'attachment_text', 'full_text_length', 'truncated_text_length']
-    if all(field in entry for field in required_fields):
+    if not REQUIRED_FIELDS - entry.keys():
         return entry
     
     # Get comment IDs for this entry
@@ -78,8 +138,8 @@ def fix_lookup_entry(entry: Dict, raw_data_map: Dict[str, Dict], attachments_dir
     all_attachment_texts = []
     
     for comment_id in comment_ids:
-        if comment_id in raw_data_map:
-            text_data = extract_text_from_comment(raw_data_map[comment_id], attachments_dir)
+        if comment_id in comment_texts:
+            text_data = comment_texts[comment_id]
             
             comment_text = text_data['comment_text']
             attachment_text = text_data['attachment_text']
@@ -93,7 +153,8 @@ def fix_lookup_entry(entry: Dict, raw_data_map: Dict[str, Dict], attachments_dir
     combined_comment_text = '\n\n'.join(all_comment_texts)
     combined_attachment_text = '\n\n--- NEXT ATTACHMENT ---\n\n'.join(all_attachment_texts)
     
-    # Create full text (same logic as in the pipeline)
+    # Length of the full text (same layout as in the pipeline), counted from its
+    # parts rather than joining a third copy of the text just to measure it
     full_text_parts = []
     if combined_comment_text:
         full_text_parts.append(combined_comment_text)
@@ -101,12 +162,12 @@ def fix_lookup_entry(entry: Dict, raw_data_map: Dict[str, Dict], attachments_dir
         full_text_parts.append('--- ATTACHMENT CONTENT ---')
         full_text_parts.append(combined_attachment_text)
     
-    full_text = '\n\n'.join(full_text_parts)
+    full_text_length = sum(map(len, full_text_parts)) + len('\n\n') * max(0, len(full_text_parts) - 1)
     
     # Update entry with missing fields
     entry['comment_text'] = combined_comment_text
     entry['attachment_text'] = combined_attachment_text
-    entry['full_text_length'] = len(full_text)
+    entry['full_text_length'] = full_text_length
     entry['truncated_text_length'] = len(entry.get('truncated_text', ''))
     
     return entry
@@ -119,21 +180,12 @@ def main():
     
     # Load data
     logger.info("Loading lookup table...")
-    with open(lookup_table_path, 'r') as f:
-        lookup_table = json.load(f)
+    lookup_table = load_json_mapped(lookup_table_path)
     
     logger.info(f"Loaded {len(lookup_table):,} lookup entries")
     
-    # Load raw data mapping
-    raw_data_map = load_raw_data_mapping(raw_data_path)
-    
     # Find entries missing required fields
-    required_fields = ['comment_text', 'attachment_text', 'full_text_length', 'truncated_text_length']
-    missing_fields_entries = []
-    
-    for i, entry in enumerate(lookup_table):
-        if any(field not in entry for field in required_fields):
-            missing_fields_entries.append((i, entry))
+    missing_fields_entries = [(i, entry) for i, entry in enumerate(lookup_table) if REQUIRED_FIELDS - entry.keys()]
     
     logger.info(f"Found {len(missing_fields_entries):,} entries missing required fields")
     
@@ -141,19 +193,24 @@ def main():
         logger.info("All entries already have required fields!")
         return
     
+    # Load raw data mapping, keeping only the comments the fix will read
+    needed_ids = {comment_id for _, entry in missing_fields_entries for comment_id in entry.get('comment_ids', [])}
+    raw_data_map = load_raw_data_mapping(raw_data_path, needed_ids)
+    
+    # Read every needed comment's text and attachments up front, concurrently
+    logger.info("Reading comment and attachment text...")
+    attachment_index = build_attachment_index(attachments_dir, needed_ids)
+    comment_texts = load_comment_texts(needed_ids, raw_data_map, attachment_index)
+    
     # Fix entries
     logger.info("Fixing missing fields...")
     fixed_count = 0
     
-    for i, (index, entry) in enumerate(missing_fields_entries):
+    for index, entry in tqdm(missing_fields_entries, desc="Fixing entries", unit="entry"):
         try:
-            fixed_entry = fix_lookup_entry(entry, raw_data_map, attachments_dir)
+            fixed_entry = fix_lookup_entry(entry, comment_texts)
             lookup_table[index] = fixed_entry
             fixed_count += 1
-            
-            if (i + 1) % 100 == 0:
-                logger.info(f"Fixed {i + 1:,}/{len(missing_fields_entries):,} entries")
-                
         except Exception as e:
             logger.error(f"Error fixing entry {entry.get('lookup_id')}: {e}")
     
@@ -161,17 +218,20 @@ def main():
     
     # Save updated lookup table
     logger.info("Saving updated lookup table...")
-    with open(lookup_table_path, 'w') as f:
-        json.dump(lookup_table, f, indent=2)
+    # The table is streamed out in chunks to a temporary file that then replaces the
+    # original, so an interrupted save never leaves a truncated lookup table behind.
+    # It is written compact (no indentation), the same format the pipeline uses
+    # for lookup_table.json, so the file is no longer pretty-printed after a fix
+    temp_path = f"{lookup_table_path}.tmp"
+    dump_json_compact(lookup_table, temp_path)
+    os.replace(temp_path, lookup_table_path)
     
     logger.info("✅ Schema compliance fix complete!")
     
-    # Verify fix worked
+    # Verify fix worked; entries that were complete at the start were never touched,
+    # so only the ones the fix loop visited need checking
     logger.info("Verifying fix...")
-    still_missing = 0
-    for entry in lookup_table:
-        if any(field not in entry for field in required_fields):
-            still_missing += 1
+    still_missing = sum(1 for index, _ in missing_fields_entries if REQUIRED_FIELDS - lookup_table[index].keys())
     
     if still_missing == 0:
         logger.info("✅ All entries now have required fields!")
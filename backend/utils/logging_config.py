@@ -37,9 +37,10 @@ class PipelineLogger:
         """
         logger = logging.getLogger(name)
         
-        # Clear existing handlers to avoid duplicates
+        # Clear existing handlers to avoid duplicates, closing them so their files are released
         for handler in logger.handlers[:]:
             logger.removeHandler(handler)
+            handler.close()
         
         logger.setLevel(level)
         
@@ -65,7 +66,7 @@ class PipelineLogger:
                 log_file = f"{name.replace('.', '_')}_{timestamp}.log" if timestamp else f"{name.replace('.', '_')}.log"
             
             file_path = output_path / log_file
-            file_handler = logging.FileHandler(file_path)
+            file_handler = logging.FileHandler(file_path, encoding='utf-8', errors='replace')
             file_handler.setLevel(level)
             file_handler.setFormatter(formatter)
             logger.addHandler(file_handler)
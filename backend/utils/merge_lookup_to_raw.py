@@ -2,13 +2,35 @@
 """
 Script to merge raw_data.json with lookup_table.json
 Creates a data.json file with row-level data including LLM info
+
+Usage (from the repository root):
+python -m backend.utils.merge_lookup_to_raw
 """
 import json
 import logging
+import os
+from functools import lru_cache
+from types import MappingProxyType
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterable, Iterator, Set
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to loading the whole file
+    ijson = None
+
+try:
+    from backend.utils.common import load_json_mapped
+except ImportError:
+    # Standalone script run from this directory
+    from common import load_json_mapped
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -16,8 +38,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Define lookup fields with their default values
-LOOKUP_FIELDS = {
+# Define lookup fields with their default values (read-only; see LIST_LOOKUP_FIELDS)
+LOOKUP_FIELDS = MappingProxyType({
     'lookup_id': None,
     'truncated_text': None,
     'text_source': None,
@@ -32,7 +54,11 @@ LOOKUP_FIELDS = {
     'cluster_id': None,
     'pca_x': None,
     'pca_y': None
-}
+})
+
+# Lookup fields whose default is a list; each use gets a fresh empty list so no two
+# records (or the defaults above) ever share one mutable object
+LIST_LOOKUP_FIELDS = tuple(field for field, default_value in LOOKUP_FIELDS.items() if isinstance(default_value, list))
 
 # Define expected fields schema with types and requirements
 EXPECTED_FIELDS_SCHEMA = {
@@ -84,23 +110,59 @@ EXPECTED_FIELDS_SCHEMA = {
     'pca_y': {'type': float, 'required': False, 'nullable': True}
 }
 
+# EXPECTED_FIELDS_SCHEMA flattened once into tuples for the per-comment validation loop:
+# (name, required, nullable, type, type label for messages, date_format, allowed_values)
+COMPILED_FIELDS_SCHEMA = tuple(
+    (
+        field_name,
+        field_spec.get('required', False),
+        field_spec.get('nullable', True),
+        field_spec.get('type'),
+        # Tuples of types print as-is (e.g. for themes which can be list or str)
+        str(field_spec['type']) if isinstance(field_spec.get('type'), tuple) else getattr(field_spec.get('type'), '__name__', None),
+        field_spec.get('date_format', False),
+        field_spec.get('allowed_values')
+    )
+    for field_name, field_spec in EXPECTED_FIELDS_SCHEMA.items()
+)
+
+# Write buffer for data.json; records are a few KB each, so the default 8 KB buffer
+# would hand almost every record to the OS separately
+JSON_ARRAY_WRITE_BUFFER = 1 << 20
+
+# (index, name) for each schema field, for the coverage counters in MergedDataValidator
+COVERAGE_FIELDS = tuple(enumerate(EXPECTED_FIELDS_SCHEMA))
+
 def load_json_file(filepath: Path) -> Any:
     """Load JSON data from file"""
     logger.info(f"Loading {filepath}")
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_json_mapped(filepath)
+
+def iter_json_array(filepath: Path) -> Iterator[Any]:
+    """Yield the items of a JSON array file one at a time, streaming with ijson when installed"""
+    if ijson is None:
+        yield from load_json_file(filepath)
+        return
+    
+    logger.info(f"Streaming {filepath}")
+    with open(filepath, 'rb') as f:
+        # use_float keeps numbers as floats rather than Decimals, as json.load would
+        yield from ijson.items(f, 'item', use_float=True)
 
 def create_lookup_mapping(lookup_data: List[Dict]) -> Dict[str, Dict]:
     """Create a mapping from comment_id to lookup info"""
     logger.info("Creating lookup mapping...")
     mapping = {}
-    duplicate_ids = []
+    duplicate_ids: Set[str] = set()
     
     for lookup_entry in lookup_data:
         # Extract fields using the defined LOOKUP_FIELDS as reference
         lookup_info = {}
         for field, default_value in LOOKUP_FIELDS.items():
             lookup_info[field] = lookup_entry.get(field, default_value)
+        for field in LIST_LOOKUP_FIELDS:
+            if field not in lookup_entry:
+                lookup_info[field] = []
         
         # Map to all comment IDs associated with this lookup entry
         comment_ids = lookup_entry.get('comment_ids', [])
@@ -109,14 +171,14 @@ def create_lookup_mapping(lookup_data: List[Dict]) -> Dict[str, Dict]:
         
         for comment_id in comment_ids:
             if comment_id in mapping:
-                duplicate_ids.append(comment_id)
-                logger.warning(f"Comment ID {comment_id} appears in multiple lookup entries - keeping first occurrence")
-                # Skip adding this duplicate - keep the first occurrence
+                # Skip adding this duplicate - keep the first occurrence; duplicates
+                # are reported together once the whole table has been read
+                duplicate_ids.add(comment_id)
                 continue
             mapping[comment_id] = lookup_info
     
     if duplicate_ids:
-        unique_duplicates = list(set(duplicate_ids))
+        unique_duplicates = list(duplicate_ids)
         logger.warning(f"Found {len(unique_duplicates)} comment IDs that appear in multiple lookup entries")
         logger.warning(f"Duplicate IDs: {unique_duplicates[:10]}{'...' if len(unique_duplicates) > 10 else ''}")
         logger.warning("Kept only the first occurrence of each duplicate")
@@ -124,27 +186,34 @@ def create_lookup_mapping(lookup_data: List[Dict]) -> Dict[str, Dict]:
     logger.info(f"Created mapping for {len(mapping)} comments")
     return mapping
 
+# Distinct date strings whose validity is remembered; comments share few distinct timestamps
+DATE_FORMAT_CACHE_SIZE = 1 << 16
+
 def validate_date_format(date_str: str) -> bool:
     """Check if string is in ISO 8601 format"""
-    if not date_str:
+    # Non-strings are never valid dates (and may not be hashable for the cache)
+    return isinstance(date_str, str) and _is_iso_date(date_str)
+
+@lru_cache(maxsize=DATE_FORMAT_CACHE_SIZE)
+def _is_iso_date(date_str: str) -> bool:
+    """validate_date_format for strings, cached per distinct string"""
+    # Check basic ISO format YYYY-MM-DDTHH:MMZ; only strings of that shape reach the parser
+    if not date_str or 'T' not in date_str or not date_str.endswith('Z'):
         return False
     try:
-        # Check basic ISO format YYYY-MM-DDTHH:MMZ
-        if 'T' in date_str and date_str.endswith('Z'):
-            datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            return True
-        return False
-    except:
+        datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except ValueError:
         return False
+    return True
 
 def validate_comment_fields(comment: Dict, comment_id: str) -> List[str]:
     """Validate that comment has all required fields with correct types"""
     issues = []
     
-    for field_name, field_spec in EXPECTED_FIELDS_SCHEMA.items():
+    for field_name, required, nullable, expected_type, type_label, date_format, allowed_values in COMPILED_FIELDS_SCHEMA:
         # Check if field exists
         if field_name not in comment:
-            if field_spec.get('required', False):
+            if required:
                 issues.append(f"Missing required field '{field_name}'")
             continue
         
@@ -152,96 +221,115 @@ def validate_comment_fields(comment: Dict, comment_id: str) -> List[str]:
         
         # Check nullable constraint
         if field_value is None:
-            if not field_spec.get('nullable', True):
+            if not nullable:
                 issues.append(f"Field '{field_name}' cannot be null")
             continue
         
         # Check type
-        expected_type = field_spec.get('type')
-        if expected_type:
-            # Handle tuple of types (like for themes which can be list or str)
-            if isinstance(expected_type, tuple):
-                if not isinstance(field_value, expected_type):
-                    issues.append(f"Field '{field_name}' has wrong type: expected {expected_type}, got {type(field_value)}")
-            else:
-                if not isinstance(field_value, expected_type):
-                    issues.append(f"Field '{field_name}' has wrong type: expected {expected_type.__name__}, got {type(field_value).__name__}")
+        if expected_type and not isinstance(field_value, expected_type):
+            type_name = type(field_value) if isinstance(expected_type, tuple) else type(field_value).__name__
+            issues.append(f"Field '{field_name}' has wrong type: expected {type_label}, got {type_name}")
         
         # Check date format
-        if field_spec.get('date_format') and field_value:
+        if date_format and field_value:
             if not validate_date_format(field_value):
                 issues.append(f"Field '{field_name}' has invalid date format: {field_value} (expected ISO 8601)")
         
         # Check allowed values
-        allowed_values = field_spec.get('allowed_values')
-        if allowed_values and field_value is not None:
-            if field_value not in allowed_values:
-                issues.append(f"Field '{field_name}' has invalid value: {field_value} (allowed: {allowed_values})")
+        if allowed_values and field_value not in allowed_values:
+            issues.append(f"Field '{field_name}' has invalid value: {field_value} (allowed: {allowed_values})")
     
     return issues
 
-def validate_merged_data(merged_data: List[Dict]) -> Dict[str, Any]:
-    """Validate all comments in merged data and return validation report"""
-    logger.info("Validating merged data...")
+class MergedDataValidator:
+    """Incrementally validate merged comments so the full merged list never has to be held in memory"""
     
-    total_comments = len(merged_data)
-    comments_with_issues = 0
-    all_issues = {}
-    field_coverage = {}
-    
-    # Initialize field coverage tracking
-    for field_name in EXPECTED_FIELDS_SCHEMA:
-        field_coverage[field_name] = {
-            'present_count': 0,
-            'non_null_count': 0,
-            'type_errors': 0
-        }
+    def __init__(self):
+        self.total_comments = 0
+        self.comments_with_issues = 0
+        self.all_issues = {}
+        # Field coverage counts, indexed like COMPILED_FIELDS_SCHEMA; plain int lists
+        # are cheaper to bump per comment than a dict of dicts
+        self.present_counts = [0] * len(COMPILED_FIELDS_SCHEMA)
+        self.non_null_counts = [0] * len(COMPILED_FIELDS_SCHEMA)
     
-    # Validate each comment
-    for comment in merged_data:
+    def add(self, comment: Dict) -> None:
+        """Validate a single merged comment and update coverage counts"""
+        self.total_comments += 1
         comment_id = comment.get('id', 'UNKNOWN')
         issues = validate_comment_fields(comment, comment_id)
         
         if issues:
-            comments_with_issues += 1
-            all_issues[comment_id] = issues
+            self.comments_with_issues += 1
+            self.all_issues[comment_id] = issues
         
         # Track field coverage
-        for field_name in EXPECTED_FIELDS_SCHEMA:
+        present_counts = self.present_counts
+        non_null_counts = self.non_null_counts
+        for i, field_name in COVERAGE_FIELDS:
             if field_name in comment:
-                field_coverage[field_name]['present_count'] += 1
+                present_counts[i] += 1
                 if comment[field_name] is not None:
-                    field_coverage[field_name]['non_null_count'] += 1
-    
-    # Create validation report
-    report = {
-        'total_comments': total_comments,
-        'comments_with_issues': comments_with_issues,
-        'validation_passed': comments_with_issues == 0,
-        'field_coverage': field_coverage,
-        'sample_issues': dict(list(all_issues.items())[:10]) if all_issues else {}
-    }
-    
-    # Log summary
-    logger.info(f"Validation complete: {total_comments} comments checked")
-    if comments_with_issues > 0:
-        logger.warning(f"Found {comments_with_issues} comments with validation issues")
-        logger.warning("Sample issues:")
-        for comment_id, issues in list(all_issues.items())[:5]:
-            logger.warning(f"  Comment {comment_id}:")
-            for issue in issues[:3]:  # Show first 3 issues per comment
-                logger.warning(f"    - {issue}")
-    else:
-        logger.info("All comments passed validation!")
+                    non_null_counts[i] += 1
     
-    # Log field coverage summary
-    logger.info("Field coverage summary:")
-    for field_name, coverage in field_coverage.items():
-        coverage_pct = (coverage['present_count'] / total_comments * 100) if total_comments > 0 else 0
-        non_null_pct = (coverage['non_null_count'] / total_comments * 100) if total_comments > 0 else 0
-        logger.info(f"  {field_name}: {coverage_pct:.1f}% present, {non_null_pct:.1f}% non-null")
+    @property
+    def field_coverage(self) -> Dict[str, Dict[str, int]]:
+        """Per-field coverage counts in the validation report's format"""
+        return {
+            field_name: {
+                'present_count': self.present_counts[i],
+                'non_null_count': self.non_null_counts[i],
+                'type_errors': 0
+            }
+            for i, field_name in COVERAGE_FIELDS
+        }
     
-    return report
+    def report(self) -> Dict[str, Any]:
+        """Build the validation report and log a summary"""
+        total_comments = self.total_comments
+        comments_with_issues = self.comments_with_issues
+        all_issues = self.all_issues
+        field_coverage = self.field_coverage
+        
+        # Create validation report
+        report = {
+            'total_comments': total_comments,
+            'comments_with_issues': comments_with_issues,
+            'validation_passed': comments_with_issues == 0,
+            'field_coverage': field_coverage,
+            'sample_issues': dict(list(all_issues.items())[:10]) if all_issues else {}
+        }
+        
+        # Log summary
+        logger.info(f"Validation complete: {total_comments} comments checked")
+        if comments_with_issues > 0:
+            logger.warning(f"Found {comments_with_issues} comments with validation issues")
+            logger.warning("Sample issues:")
+            for comment_id, issues in list(all_issues.items())[:5]:
+                logger.warning(f"  Comment {comment_id}:")
+                for issue in issues[:3]:  # Show first 3 issues per comment
+                    logger.warning(f"    - {issue}")
+        else:
+            logger.info("All comments passed validation!")
+        
+        # Log field coverage summary
+        logger.info("Field coverage summary:")
+        for field_name, coverage in field_coverage.items():
+            coverage_pct = (coverage['present_count'] / total_comments * 100) if total_comments > 0 else 0
+            non_null_pct = (coverage['non_null_count'] / total_comments * 100) if total_comments > 0 else 0
+            logger.info(f"  {field_name}: {coverage_pct:.1f}% present, {non_null_pct:.1f}% non-null")
+        
+        return report
+
+def validate_merged_data(merged_data: Iterable[Dict]) -> Dict[str, Any]:
+    """Validate all comments in merged data and return validation report"""
+    logger.info("Validating merged data...")
+    
+    validator = MergedDataValidator()
+    for comment in merged_data:
+        validator.add(comment)
+    
+    return validator.report()
 
 def flatten_comment(comment: Dict) -> Dict:
     """Flatten comment structure if it has nested attributes"""
@@ -303,15 +391,19 @@ def flatten_comment(comment: Dict) -> Dict:
         # Already flat structure
         return comment
 
-def merge_data(raw_data: List[Dict], lookup_mapping: Dict[str, Dict]) -> List[Dict]:
-    """Merge raw data with lookup information"""
-    logger.info("Merging data...")
-    merged_data = []
+def iter_merged_comments(raw_data: Iterable[Dict], lookup_mapping: Dict[str, Dict]) -> Iterator[Dict]:
+    """
+    Yield raw comments merged with their lookup information, one at a time.
+    
+    Consistency checks (unmatched comments, orphaned lookup entries) run once the
+    raw data is exhausted, so callers must consume the whole iterator.
+    """
     matched_count = 0
+    merged_count = 0
     unmatched_comments = []
     
     # Track all comment IDs from raw data
-    raw_comment_ids = set()
+    raw_comment_ids: Set[str] = set()
     
     for comment in raw_data:
         # First flatten the comment if needed
@@ -323,7 +415,9 @@ def merge_data(raw_data: List[Dict], lookup_mapping: Dict[str, Dict]) -> List[Di
             raise ValueError("Found comment without ID in raw_data")
         
         raw_comment_ids.add(comment_id)
-        merged_comment = flattened_comment.copy()
+        # Flattening a nested comment already builds a new dict that can be extended in
+        # place; only an already-flat comment (returned as-is) is copied
+        merged_comment = flattened_comment if flattened_comment is not comment else comment.copy()
         
         # Add lookup info if available
         if comment_id in lookup_mapping:
@@ -332,10 +426,14 @@ def merge_data(raw_data: List[Dict], lookup_mapping: Dict[str, Dict]) -> List[Di
         else:
             # Track unmatched comments
             unmatched_comments.append(comment_id)
-            # Add empty lookup fields for comments without lookup data
-            merged_comment.update(LOOKUP_FIELDS.copy())
+            # Add empty lookup fields for comments without lookup data; update() copies
+            # the entries itself, so the defaults need no intermediate dict
+            merged_comment.update(LOOKUP_FIELDS)
+            for field in LIST_LOOKUP_FIELDS:
+                merged_comment[field] = []
         
-        merged_data.append(merged_comment)
+        merged_count += 1
+        yield merged_comment
     
     # Check for lookup entries that don't have corresponding raw data
     lookup_comment_ids = set(lookup_mapping.keys())
@@ -357,11 +455,60 @@ def merge_data(raw_data: List[Dict], lookup_mapping: Dict[str, Dict]) -> List[Di
             logger.error(f"  ... and {len(orphaned_lookup_ids) - 10} more")
         raise ValueError(f"Found {len(orphaned_lookup_ids)} lookup entries that reference non-existent comments")
     
-    logger.info(f"Merged {len(merged_data)} comments, {matched_count} with lookup data")
+    logger.info(f"Merged {merged_count} comments, {matched_count} with lookup data")
     if unmatched_comments:
         logger.info(f"Note: {len(unmatched_comments)} comments have no lookup data (this may be expected)")
+
+def merge_data(raw_data: List[Dict], lookup_mapping: Dict[str, Dict]) -> List[Dict]:
+    """Merge raw data with lookup information"""
+    logger.info("Merging data...")
+    return list(iter_merged_comments(raw_data, lookup_mapping))
+
+def write_json_array(items: Iterable[Any], output_path: Union[str, Path], indent: int = 2) -> int:
+    """
+    Stream items to a JSON array file without building the whole document in memory.
+    
+    Items are encoded with orjson when it is installed and indent is 2, otherwise with
+    json.dumps(indent=indent, ensure_ascii=False). The layout is the same either way,
+    but the orjson output is not byte-identical to json.dump: floats may be spelled
+    differently (1e-05 as 0.00001) and NaN and Infinity are written as null.
+    
+    The file is written to a temporary path and moved into place only once every item
+    has been written, so a failure part-way through never leaves a truncated file behind.
+    
+    Returns:
+        Number of items written
+    """
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    pad = b' ' * indent
+    count = 0
+    
+    if orjson is not None and indent == 2:
+        # orjson only pretty-prints with a 2-space indent
+        def encode(item):
+            return orjson.dumps(item, option=orjson.OPT_INDENT_2)
+    else:
+        def encode(item):
+            return json.dumps(item, indent=indent, ensure_ascii=False).encode('utf-8')
     
-    return merged_data
+    try:
+        with open(tmp_path, 'wb', buffering=JSON_ARRAY_WRITE_BUFFER) as f:
+            f.write(b'[')
+            for item in items:
+                # Neither encoder emits raw newlines inside strings, so re-indenting
+                # each line nests the item one level inside the array
+                encoded = encode(item).replace(b'\n', b'\n' + pad)
+                f.write((b'\n' if count == 0 else b',\n') + pad + encoded)
+                count += 1
+            f.write(b'\n]' if count else b']')
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+    
+    return count
 
 def main():
     """Main function to merge raw data with lookup table"""
@@ -373,40 +520,8 @@ def main():
     lookup_path = data_dir / 'lookup_table.json'
     output_path = data_dir / 'data.json'
     
-    try:
-        # Load data
-        raw_data = load_json_file(raw_data_path)
-        lookup_data = load_json_file(lookup_path)
-        
-        # Create lookup mapping
-        lookup_mapping = create_lookup_mapping(lookup_data)
-        
-        # Merge data
-        merged_data = merge_data(raw_data, lookup_mapping)
-        
-        # Validate merged data
-        validation_report = validate_merged_data(merged_data)
-        
-        # Save validation report
-        validation_report_path = data_dir / 'data_validation_report.json'
-        logger.info(f"Saving validation report to {validation_report_path}")
-        with open(validation_report_path, 'w', encoding='utf-8') as f:
-            json.dump(validation_report, f, indent=2, ensure_ascii=False)
-        
-        # Save merged data
-        logger.info(f"Saving merged data to {output_path}")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(merged_data, f, indent=2, ensure_ascii=False)
-        
-        # Log final status
-        if validation_report['validation_passed']:
-            logger.info("Merge completed successfully - all data validated!")
-        else:
-            logger.warning(f"Merge completed with {validation_report['comments_with_issues']} validation issues - check validation report")
-        
-    except Exception as e:
-        logger.error(f"Error during merge: {e}")
-        raise
+    # Merge, validate and write in one streaming pass
+    merge_lookup_to_raw(str(raw_data_path), str(lookup_path), str(output_path))
 
 def merge_lookup_to_raw(raw_data_path: str, lookup_path: str, output_path: str) -> None:
     """
@@ -418,24 +533,26 @@ def merge_lookup_to_raw(raw_data_path: str, lookup_path: str, output_path: str)
         output_path: Path to save merged data.json file
     """
     try:
-        # Load data
-        raw_data = load_json_file(Path(raw_data_path))
-        lookup_data = load_json_file(Path(lookup_path))
+        # Build the comment_id -> lookup info mapping first so the lookup table can be freed
+        lookup_mapping = create_lookup_mapping(load_json_file(Path(lookup_path)))
+        # Raw comments are parsed one at a time as they are merged and written
+        raw_data = iter_json_array(Path(raw_data_path))
         
-        # Create lookup mapping
-        lookup_mapping = create_lookup_mapping(lookup_data)
+        # Merge, validate and write each comment as it streams through
+        logger.info("Merging data...")
+        validator = MergedDataValidator()
         
-        # Merge data
-        merged_data = merge_data(raw_data, lookup_mapping)
+        def merged_and_validated():
+            for merged_comment in iter_merged_comments(raw_data, lookup_mapping):
+                validator.add(merged_comment)
+                yield merged_comment
         
-        # Validate merged data
-        validation_results = validate_merged_data(merged_data)
+        merged_count = write_json_array(merged_and_validated(), output_path)
         
-        # Save merged data
-        with open(output_path, 'w') as f:
-            json.dump(merged_data, f, indent=2)
+        logger.info("Validating merged data...")
+        validation_results = validator.report()
         
-        logger.info(f"✅ Successfully merged {len(merged_data)} comments to {output_path}")
+        logger.info(f"✅ Successfully merged {merged_count} comments to {output_path}")
         
         # Save validation report
         validation_report_path = Path(output_path).parent / 'data_validation_report.json'
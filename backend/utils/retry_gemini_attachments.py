@@ -304,7 +304,7 @@ def update_lookup_table(results_dir: str, updated_comments: Set[str]) -> bool:
     
     # Save updated lookup table
     with open(lookup_path, 'w') as f:
-        json.dump(lookup_table, f, indent=2)
+        json.dump(lookup_table, f, separators=(',', ':'))
     
     logger.info(f"Updated {len(updated_lookup_ids)} lookup table entries")
     return len(updated_lookup_ids) > 0
@@ -117,6 +117,18 @@ class TestDataFetching(TestPipelineBase):
         self.assertTrue(comment['attributes']['comment'].strip())
         self.assertIn('CI testing purposes', comment['attributes']['comment'])
     
+    def test_csv_reading_inline(self):
+        """Test that inline CSV reading returns the same comments without writing a file."""
+        raw_data_file = read_comments_from_csv(str(self.test_csv), str(self.output_dir), limit=10)
+        with open(raw_data_file) as f:
+            raw_data = json.load(f)
+        os.remove(raw_data_file)
+        
+        inline_data = read_comments_from_csv(str(self.test_csv), None, limit=10, return_inline=True)
+        
+        self.assertEqual(inline_data, raw_data)
+        self.assertFalse(os.path.exists(raw_data_file))
+    
     def test_lookup_table_creation(self):
         """Test lookup table creation from raw data."""
         # First get raw data
@@ -425,6 +437,30 @@ class TestSchemaValidation(TestPipelineBase):
         except jsonschema.ValidationError as e:
             self.fail(f"Valid lookup table failed schema validation: {e.message}")
 
+    def test_streamed_merge_matches_in_memory_merge(self):
+        """Test that the streaming data.json writer produces the same file as json.dump."""
+        from backend.utils.merge_lookup_to_raw import merge_lookup_to_raw, merge_data, create_lookup_mapping
+
+        raw_data_file = self.project_root / "tests" / "raw_data.json"
+        lookup_file = self.project_root / "tests" / "lookup_table.json"
+        data_file = self.output_dir / "data.json"
+
+        merge_lookup_to_raw(str(raw_data_file), str(lookup_file), str(data_file))
+
+        with open(raw_data_file) as f:
+            raw_data = json.load(f)
+        with open(lookup_file) as f:
+            lookup_data = json.load(f)
+        expected = merge_data(raw_data, create_lookup_mapping(lookup_data))
+
+        # orjson and json differ only in float spelling (1e-8 vs 1e-08), so compare
+        # parsed content plus the 2-space array layout
+        with open(data_file, encoding='utf-8') as f:
+            written = f.read()
+        self.assertEqual(json.loads(written), expected)
+        self.assertTrue(written.startswith('[\n  {\n    "id": '))
+        self.assertValidJSON(str(data_file), self.data_schema)
+
 
 class TestAttachmentProcessing(TestPipelineBase):
     """Test attachment download and text extraction components."""